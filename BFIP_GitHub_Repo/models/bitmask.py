@@ -0,0 +1,177 @@
+# ion_phase_lab/models/bitmask.py
+"""
+Bit-packed BFIP masks.
+
+A mask keeps one bit per grid cell in uint64 words (np.packbits of the
+flattened mask, zero-padded to a whole word) together with its shape,
+optional parameter axes {name: values} and run metadata, so a boolean map
+costs 1/64 of an int64 array. AND / OR / XOR / NOT and popcount work on the
+packed words directly; nothing is unpacked until unpack_mask.
+
+On disk a mask is a directory (conventionally `<name>.bfipmask/`) with
+- meta.json: shape, axes and metadata
+- bits.npy: the packed bytes, loadable memory-mapped
+"""
+import json
+import os
+
+import numpy as np
+
+from .result_store import _write_json
+
+MASK_FORMAT = 'bfip-bitmask'
+MASK_VERSION = 1
+WORD_BYTES = 8
+COUNT_CHUNK = 1 << 20     # words per block in pattern_counts
+
+# popcount of every byte, for NumPy without np.bitwise_count
+_BYTE_COUNTS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def pack_mask(mask, axes=None, metadata=None):
+    """
+    Bit-pack a boolean array (any shape; nonzero = True).
+
+    axes, if given, maps one name per dimension to its coordinate values
+    and must match the mask's shape.
+    """
+    mask = np.asarray(mask)
+    if axes is not None:
+        axes = {name: np.asarray(values) for name, values in axes.items()}
+        if tuple(len(v) for v in axes.values()) != mask.shape:
+            raise ValueError(f"Axes {[len(v) for v in axes.values()]} do not match mask shape {mask.shape}")
+    packed = np.packbits(mask.astype(bool, copy=False).ravel())
+    n_words = -(-packed.size // WORD_BYTES)
+    raw = np.zeros(n_words * WORD_BYTES, dtype=np.uint8)
+    raw[:packed.size] = packed
+    return {'bits': raw, 'shape': mask.shape, 'axes': axes or {}, 'metadata': dict(metadata or {})}
+
+
+def unpack_mask(m):
+    """The boolean array a packed mask holds"""
+    n = int(np.prod(m['shape'], dtype=np.int64))
+    return np.unpackbits(np.asarray(m['bits']), count=n).astype(bool).reshape(m['shape'])
+
+
+def _words(m):
+    return np.asarray(m['bits']).view(np.uint64)
+
+
+def _like(m, words):
+    return {'bits': words.view(np.uint8), 'shape': m['shape'], 'axes': m['axes'], 'metadata': {}}
+
+
+def _check_same(masks):
+    shapes = {tuple(m['shape']) for m in masks}
+    if len(shapes) > 1:
+        raise ValueError(f"Masks have different shapes: {sorted(shapes)}")
+
+
+def _tail(m):
+    """Word-sized mask of the valid bits of the last word (padding bits are 0)"""
+    n = int(np.prod(m['shape'], dtype=np.int64))
+    last = np.zeros(WORD_BYTES * 8, dtype=bool)
+    last[:n - (_words(m).size - 1) * WORD_BYTES * 8] = True
+    return np.packbits(last).view(np.uint64)[0]
+
+
+def mask_and(*masks):
+    """Cellwise AND of one or more packed masks"""
+    _check_same(masks)
+    return _like(masks[0], np.bitwise_and.reduce([_words(m) for m in masks]))
+
+
+def mask_or(*masks):
+    """Cellwise OR of one or more packed masks"""
+    _check_same(masks)
+    return _like(masks[0], np.bitwise_or.reduce([_words(m) for m in masks]))
+
+
+def mask_xor(*masks):
+    """Cellwise XOR (odd parity) of one or more packed masks"""
+    _check_same(masks)
+    return _like(masks[0], np.bitwise_xor.reduce([_words(m) for m in masks]))
+
+
+def mask_not(m):
+    """Cellwise NOT; the padding past the last cell stays zero"""
+    words = ~_words(m)
+    if words.size:
+        words[-1] &= _tail(m)
+    return _like(m, words)
+
+
+def _popcount(words):
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(_BYTE_COUNTS[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def popcount(m):
+    """Number of True cells"""
+    return _popcount(_words(m))
+
+
+def pattern_counts(masks):
+    """
+    Cell counts of every overlap pattern of N packed masks, straight from
+    the words. Index p of the returned (2**N,) array counts cells whose bits
+    read p with the first mask as the most significant bit, as in
+    bfip_logic.overlap_patterns. Words are processed in blocks, so
+    memory-mapped masks are streamed.
+    """
+    _check_same(masks)
+    n = len(masks)
+    counts = np.zeros(1 << n, dtype=np.int64)
+    if not n:
+        return counts
+    n_words = _words(masks[0]).size
+    tail = _tail(masks[0])
+    for start in range(0, n_words, COUNT_CHUNK):
+        block = [np.array(_words(m)[start:start + COUNT_CHUNK]) for m in masks]
+        valid = np.full(block[0].shape, np.uint64(0xFFFFFFFFFFFFFFFF))
+        if start + COUNT_CHUNK >= n_words:
+            valid[-1] = tail
+        for p in range(1 << n):
+            words = valid.copy()
+            for k, w in enumerate(block):
+                words &= w if (p >> (n - 1 - k)) & 1 else ~w
+            counts[p] += _popcount(words)
+    return counts
+
+
+def save_mask(path, m):
+    """Write a packed mask directory (meta.json + bits.npy)"""
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'bits.npy'), np.asarray(m['bits'], dtype=np.uint8))
+    _write_json(os.path.join(path, 'meta.json'), {
+        'format': MASK_FORMAT, 'version': MASK_VERSION,
+        'shape': list(m['shape']), 'axes': m['axes'], 'metadata': m['metadata'],
+    })
+
+
+def load_mask(path, mmap=True):
+    """
+    Read a packed mask directory. With mmap=True the bits stay on disk and
+    are paged in as the logic operations touch them.
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta.get('format') != MASK_FORMAT:
+        raise ValueError(f"{path} is not a {MASK_FORMAT} directory")
+    bits = np.load(os.path.join(path, 'bits.npy'), mmap_mode='r' if mmap else None)
+    return {'bits': bits, 'shape': tuple(meta['shape']),
+            'axes': {name: np.asarray(values) for name, values in meta['axes'].items()},
+            'metadata': meta['metadata']}
+
+
+def is_mask_path(path):
+    """True if path is a packed mask directory"""
+    return os.path.isfile(os.path.join(path, 'meta.json')) and os.path.isfile(os.path.join(path, 'bits.npy'))
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+# ion_phase_lab/models/cache.py
+"""
+Content-addressed cache for deterministic simulation calls.
+
+memoize(fn) wraps a function so each call is keyed by a SHA-256 of the
+function name, a version tag and its bound arguments (defaults included, so
+f(x) and f(x, amp=0.5) share an entry when 0.5 is the default). Results are
+looked up in two tiers:
+- memory: a per-process LRU of up to max_entries results
+- disk (optional): one pickle per key under a shared directory, written
+  atomically so several processes can fill and read it concurrently;
+  least-recently-used files are evicted once the directory exceeds max_bytes
+
+Caching is opt-in. Until configure_cache() is called (or BFIP_CACHE /
+BFIP_CACHE_DIR is set in the environment) a memoized function is a plain
+pass-through. configure_cache() exports the same variables, so worker
+processes started afterwards share the cache.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 1 << 30       # on-disk tier budget (1 GiB)
+EVICT_TO = 0.9                    # evict down to this fraction of max_bytes
+ENV_ENABLE = 'BFIP_CACHE'
+ENV_DIR = 'BFIP_CACHE_DIR'
+
+_active = None                    # cache dict from configure_cache / the environment
+_configured = False
+
+
+def _canonical(x, h):
+    """Feed a stable byte encoding of x into the hash h"""
+    if x is None or isinstance(x, (bool, str)):
+        h.update(f"{type(x).__name__}:{x!r};".encode())
+    elif isinstance(x, (int, np.integer)):
+        h.update(f"int:{int(x)};".encode())
+    elif isinstance(x, (float, np.floating)):
+        # float.hex is exact, so -46.84 and -46.840000000000003 stay distinct
+        h.update(f"float:{float(x).hex()};".encode())
+    elif isinstance(x, np.ndarray):
+        arr = np.ascontiguousarray(x)
+        h.update(f"array:{arr.dtype.str}:{arr.shape};".encode())
+        h.update(arr.tobytes())
+    elif isinstance(x, dict):
+        h.update(b"dict{")
+        for k in sorted(x, key=repr):
+            _canonical(k, h)
+            _canonical(x[k], h)
+        h.update(b"}")
+    elif isinstance(x, (list, tuple)):
+        h.update(f"{type(x).__name__}[".encode())
+        for v in x:
+            _canonical(v, h)
+        h.update(b"]")
+    else:
+        raise TypeError(f"Cannot build a cache key from {type(x).__name__}")
+
+
+def param_key(name, *args, **kwargs):
+    """Stable hex key for (name, args, kwargs); equal values give equal keys across processes"""
+    h = hashlib.sha256()
+    _canonical((name, args, sorted(kwargs.items())), h)
+    return h.hexdigest()
+
+
+def _disk_usage(directory):
+    """[(mtime, size, path)] for every entry in a disk tier"""
+    entries = []
+    for sub in os.scandir(directory):
+        if not sub.is_dir():
+            continue
+        for f in os.scandir(sub.path):
+            if f.name.endswith('.pkl'):
+                try:
+                    st = f.stat()
+                except FileNotFoundError:   # evicted by another process
+                    continue
+                entries.append((st.st_mtime, st.st_size, f.path))
+    return entries
+
+
+def open_cache(directory=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Create a cache: memory-only, or memory + disk when directory is given.
+
+    The returned dict is what cache_get / cache_put / memoize operate on;
+    its 'stats' entry counts memory hits, disk hits, misses, disk writes and
+    evictions for this process.
+    """
+    cache = {
+        'memory': OrderedDict(),
+        'max_entries': max_entries,
+        'dir': directory,
+        'max_bytes': max_bytes,
+        'disk_bytes': 0,
+        'stats': {'hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0},
+    }
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        cache['disk_bytes'] = sum(size for _, size, _ in _disk_usage(directory))
+    return cache
+
+
+def _entry_path(cache, key):
+    return os.path.join(cache['dir'], key[:2], key + '.pkl')
+
+
+def _remember(cache, key, value):
+    memory = cache['memory']
+    memory[key] = value
+    memory.move_to_end(key)
+    while len(memory) > cache['max_entries']:
+        memory.popitem(last=False)
+
+
+def _evict(cache):
+    """Drop least-recently-used disk entries until under EVICT_TO·max_bytes"""
+    entries = sorted(_disk_usage(cache['dir']))
+    total = sum(size for _, size, _ in entries)
+    target = EVICT_TO * cache['max_bytes']
+    for _, size, path in entries:
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            cache['stats']['evictions'] += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    cache['disk_bytes'] = total
+
+
+def cache_get(cache, key):
+    """(True, value) on a hit in either tier, else (False, None)"""
+    stats = cache['stats']
+    if key in cache['memory']:
+        cache['memory'].move_to_end(key)
+        stats['hits'] += 1
+        return True, cache['memory'][key]
+    if cache['dir'] is not None:
+        path = _entry_path(cache, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)          # mark as recently used for eviction
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+        else:
+            stats['disk_hits'] += 1
+            _remember(cache, key, value)
+            return True, value
+    stats['misses'] += 1
+    return False, None
+
+
+def cache_put(cache, key, value):
+    """Store value under key in memory and, if configured, on disk"""
+    _remember(cache, key, value)
+    if cache['dir'] is None:
+        return
+    path = _entry_path(cache, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write-then-rename: readers in other processes never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    cache['stats']['writes'] += 1
+    cache['disk_bytes'] += os.path.getsize(path)
+    if cache['disk_bytes'] > cache['max_bytes']:
+        # The running total misses other processes' writes; the rescan corrects it
+        _evict(cache)
+
+
+def _freeze(value):
+    """Make cached arrays read-only so callers cannot corrupt shared entries"""
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def configure_cache(directory=None, enabled=True, max_entries=DEFAULT_MAX_ENTRIES,
+                    max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Turn the process-wide cache used by memoize on (optionally with a disk
+    tier at directory) or off. Child processes inherit the setting through
+    BFIP_CACHE / BFIP_CACHE_DIR. Returns the active cache (or None).
+    """
+    global _active, _configured
+    _configured = True
+    os.environ.pop(ENV_DIR, None)
+    if not enabled:
+        os.environ.pop(ENV_ENABLE, None)
+        _active = None
+        return None
+    os.environ[ENV_ENABLE] = '1'
+    if directory is not None:
+        directory = os.path.abspath(directory)
+        os.environ[ENV_DIR] = directory
+    _active = open_cache(directory, max_entries, max_bytes)
+    return _active
+
+
+def get_cache():
+    """The process-wide cache, configured from the environment on first use"""
+    global _configured
+    if not _configured:
+        directory = os.environ.get(ENV_DIR) or None
+        if directory is not None or os.environ.get(ENV_ENABLE, '') not in ('', '0'):
+            configure_cache(directory)
+        _configured = True
+    return _active
+
+
+def cache_stats(cache=None):
+    """Hit/miss counters of cache (default: the process-wide one) plus tier sizes"""
+    cache = cache if cache is not None else get_cache()
+    if cache is None:
+        return None
+    return dict(cache['stats'], memory_entries=len(cache['memory']), disk_bytes=cache['disk_bytes'])
+
+
+def format_stats(cache=None):
+    """One-line summary of cache_stats for script output"""
+    s = cache_stats(cache)
+    if s is None:
+        return "cache disabled"
+    calls = s['hits'] + s['disk_hits'] + s['misses']
+    rate = (s['hits'] + s['disk_hits']) / calls if calls else 0.0
+    return (f"cache: {calls} calls, {s['hits']} memory hits, {s['disk_hits']} disk hits, "
+            f"{s['misses']} misses ({rate:.0%} hit rate), {s['evictions']} evicted")
+
+
+def memoize(fn=None, name=None, version=1, cache=None):
+    """
+    Decorator caching fn's results by content (see module docstring).
+
+    - name: key namespace (default module.qualname; pass an explicit one when
+      fn may run as __main__ so the disk tier is shared with imports)
+    - version: bump when fn's physics changes, so old disk entries stop matching
+    - cache: a specific cache from open_cache (default: the process-wide one,
+      so the wrapper is a pass-through until caching is enabled)
+
+    Arguments must be numbers, strings, None, arrays or dicts/lists/tuples of
+    them. Cached arrays are returned read-only.
+    """
+    if fn is None:
+        return functools.partial(memoize, name=name, version=version, cache=cache)
+    sig = inspect.signature(fn)
+    key_name = f"{name or fn.__module__ + '.' + fn.__qualname__}@v{version}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        store = cache if cache is not None else get_cache()
+        if store is None:
+            return fn(*args, **kwargs)
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = param_key(key_name, **bound.arguments)
+        hit, value = cache_get(store, key)
+        if hit:
+            return value
+        value = _freeze(fn(*args, **kwargs))
+        cache_put(store, key, value)
+        return value
+
+    wrapper.uncached = fn
+    return wrapper
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
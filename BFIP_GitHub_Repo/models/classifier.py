@@ -0,0 +1,226 @@
+# ion_phase_lab/models/classifier.py
+"""
+Lazy BFIP classification of stored metric fields.
+
+Sweeps persist the raw per-point metrics (θ̄ 'theta_mean', 'MI', 'dG') and
+the BFIP predicate
+    θ̄ > thr_theta  and  MI > thr_mi  and  ΔG < thr_dG   (default -RT·ln2)
+is applied afterwards, so changing a threshold is an array comparison rather
+than a re-run. Every threshold may be a scalar or a 1-D family; families add
+leading axes to the result, e.g. classify(fields, thr_theta=[0.05, 0.1],
+thr_mi=np.linspace(0, 3, 31)) has shape (2, 31, *field_shape).
+
+Pattern codes pack the three tests as bits (θ̄, MI, ΔG) -> '000' .. '111',
+the layout of data/BFIP_Threshold_Sweep_Results.csv.
+"""
+import argparse
+
+import numpy as np
+
+from .result_store import read_grid, read_results, store_info
+
+R_GAS = 8.314        # J/(mol·K)
+THR_THETA = 0.10
+THR_MI = 2.2
+METRICS = ('theta_mean', 'MI', 'dG')
+PATTERNS = tuple(f"{k:03b}" for k in range(8))
+FAMILY_CHUNK = 1 << 18     # points per block in threshold_family
+
+
+def dG_threshold(T, n_RTln2=1.0):
+    """ΔG cut -n·RT·ln2 in kJ/mol (the units of gibbs_free_energy with kJ ΔH)"""
+    return -n_RTln2 * (R_GAS * np.asarray(T, dtype=float) / 1000) * np.log(2)
+
+
+def load_fields(source, where=None):
+    """
+    Metric fields from a result store path (or pass a dict through).
+
+    Grid stores (written with grid_columns) come back as N-d arrays in axis
+    order; other stores as flat columns, optionally filtered by `where`. A 'T'
+    column, or the store's 'T0'/'T' metadata, supplies the temperature of the
+    default ΔG cut.
+    """
+    if isinstance(source, dict):
+        return source
+    info = store_info(source)
+    names = [c for c in METRICS + ('T',) if c in info['columns']]
+    if info['axes'] and where is None:
+        fields = {name: read_grid(source, name) for name in names}
+        # 1-D axes only where no per-cell column exists (a stored 'T' grid must keep its shape)
+        fields.update({k: v for k, v in info['axes'].items() if k not in fields})
+    else:
+        fields = dict(read_results(source, where=where, columns=names))
+    meta = info['metadata']
+    if 'T' not in fields:
+        for key in ('T0', 'T'):
+            if np.isscalar(meta.get(key)):
+                fields['T'] = float(meta[key])
+                break
+    return fields
+
+
+def _family(values, axis, n_axes, ndim):
+    """Put a 1-D threshold family on its own leading axis; scalars pass through"""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 0:
+        return values
+    shape = [1] * (n_axes + ndim)
+    shape[axis] = values.size
+    return values.reshape(shape)
+
+
+def bfip_bits(fields, thr_theta=THR_THETA, thr_mi=THR_MI, thr_dG=None, T=None):
+    """
+    The three BFIP tests as boolean arrays (θ̄ bit, MI bit, ΔG bit).
+
+    Non-scalar thresholds are families: each adds a leading axis, in the
+    order thr_theta, thr_mi, thr_dG, ahead of the field shape. thr_dG=None
+    uses -RT·ln2 at T (default: fields['T'], else 300 K).
+    """
+    theta = np.asarray(fields['theta_mean'], dtype=float)
+    mi = np.asarray(fields['MI'], dtype=float)
+    dG = np.asarray(fields['dG'], dtype=float)
+    per_point = thr_dG is None
+    if per_point:
+        # scalar, or a per-point field that broadcasts against dG (not a family)
+        thr_dG = dG_threshold(T if T is not None else fields.get('T', 300.0))
+    axis_mi = np.ndim(thr_theta)
+    axis_dG = axis_mi + np.ndim(thr_mi)
+    n_axes = axis_dG + (0 if per_point else np.ndim(thr_dG))
+    return (theta > _family(thr_theta, 0, n_axes, theta.ndim),
+            mi > _family(thr_mi, axis_mi, n_axes, mi.ndim),
+            dG < (thr_dG if per_point else _family(thr_dG, axis_dG, n_axes, dG.ndim)))
+
+
+def classify(fields, thr_theta=THR_THETA, thr_mi=THR_MI, thr_dG=None, T=None):
+    """BFIP mask: AND of bfip_bits, shape (*family axes, *field shape)"""
+    b_theta, b_mi, b_dG = bfip_bits(fields, thr_theta, thr_mi, thr_dG, T)
+    return b_theta & b_mi & b_dG
+
+
+def pattern_codes(fields, thr_theta=THR_THETA, thr_mi=THR_MI, thr_dG=None, T=None):
+    """Per-point pattern code 4·θ̄ bit + 2·MI bit + ΔG bit (uint8); PATTERNS[code] is its label"""
+    b_theta, b_mi, b_dG = bfip_bits(fields, thr_theta, thr_mi, thr_dG, T)
+    return (4 * b_theta.astype(np.uint8) + 2 * b_mi + b_dG).astype(np.uint8)
+
+
+def threshold_family(fields, thr_theta=THR_THETA, thr_mi=THR_MI, thr_dG=None, T=None,
+                     chunk=FAMILY_CHUNK):
+    """
+    Pattern counts for every threshold combination without forming the
+    (family × points) masks.
+
+    Returns an int64 array of shape (len θ̄ family, len MI family, len ΔG
+    family, 8) — scalars count as families of one — whose last axis is
+    indexed like PATTERNS. Counts come from indicator matrix products over
+    blocks of `chunk` points, so the cost is one BLAS pass per block. An
+    explicit thr_dG family needs a uniform temperature; with thr_dG=None a
+    per-point 'T' field is honoured.
+    """
+    theta = np.asarray(fields['theta_mean'], dtype=float).ravel()
+    mi = np.asarray(fields['MI'], dtype=float).ravel()
+    dG = np.asarray(fields['dG'], dtype=float).ravel()
+    thr_theta = np.atleast_1d(np.asarray(thr_theta, dtype=float))
+    thr_mi = np.atleast_1d(np.asarray(thr_mi, dtype=float))
+    if thr_dG is None:
+        cut = np.broadcast_to(dG_threshold(T if T is not None else fields.get('T', 300.0)),
+                              np.shape(fields['dG'])).ravel()
+    else:
+        thr_dG = np.atleast_1d(np.asarray(thr_dG, dtype=float))
+    n_dG = 1 if thr_dG is None else thr_dG.size
+
+    counts = np.zeros((2 * thr_theta.size, 2 * n_dG, 2 * thr_mi.size))
+    for start in range(0, theta.size, chunk):
+        sl = slice(start, start + chunk)
+        # Indicator rows [1 - bit, bit] per threshold -> (2K, n)
+        b_t = theta[sl] > thr_theta[:, None]
+        b_m = mi[sl] > thr_mi[:, None]
+        b_g = dG[sl] < (cut[sl][None, :] if thr_dG is None else thr_dG[:, None])
+        # float32 sums of 0/1 are exact while chunk < 2**24
+        ind_t = np.concatenate([~b_t, b_t]).astype(np.float32)
+        ind_m = np.concatenate([~b_m, b_m]).astype(np.float32)
+        ind_g = np.concatenate([~b_g, b_g]).astype(np.float32)
+        tg = ind_t[:, None, :] * ind_g[None, :, :]
+        counts += (tg.reshape(-1, tg.shape[-1]) @ ind_m.T).reshape(counts.shape)
+
+    # axes (x·Kθ + a, z·Kg + c, y·Km + b) -> (a, b, c, code = 4x + 2y + z)
+    counts = counts.reshape(2, thr_theta.size, 2, n_dG, 2, thr_mi.size)
+    counts = counts.transpose(1, 5, 3, 0, 4, 2).reshape(thr_theta.size, thr_mi.size, n_dG, 8)
+    return np.rint(counts).astype(np.int64)
+
+
+def threshold_sweep_table(fields, thr_theta, thr_mi, thr_dG=None, T=None):
+    """
+    threshold_family as a DataFrame: one row per threshold combination with
+    pattern counts '000'..'111', 'θ_thresh', 'mi_thresh' (plus 'dG_thresh'
+    when given) and 'total', as in data/BFIP_Threshold_Sweep_Results.csv.
+    """
+    import pandas as pd
+
+    counts = threshold_family(fields, thr_theta, thr_mi, thr_dG, T)
+    n_g = counts.shape[2]
+    grids = np.meshgrid(np.atleast_1d(thr_theta), np.atleast_1d(thr_mi),
+                        np.arange(n_g) if thr_dG is None else np.atleast_1d(thr_dG), indexing='ij')
+    table = pd.DataFrame(counts.reshape(-1, 8), columns=list(PATTERNS))
+    table['θ_thresh'] = grids[0].ravel()
+    table['mi_thresh'] = grids[1].ravel()
+    if thr_dG is not None:
+        table['dG_thresh'] = grids[2].ravel()
+    table['total'] = counts.reshape(-1, 8).sum(axis=1)
+    return table
+
+
+def lazy_classifier(source, where=None):
+    """
+    Classifier over a store (or field dict) that loads the fields on first use.
+
+    Returns classify_fn(thr_theta=..., thr_mi=..., thr_dG=None, T=None) ->
+    mask; classify_fn.family(...) and classify_fn.table(...) run
+    threshold_family / threshold_sweep_table on the same loaded fields.
+    """
+    loaded = {}
+
+    def fields():
+        if not loaded:
+            loaded.update(load_fields(source, where))
+        return loaded
+
+    def classify_fn(thr_theta=THR_THETA, thr_mi=THR_MI, thr_dG=None, T=None):
+        return classify(fields(), thr_theta, thr_mi, thr_dG, T)
+
+    classify_fn.fields = fields
+    classify_fn.family = lambda *args, **kwargs: threshold_family(fields(), *args, **kwargs)
+    classify_fn.table = lambda *args, **kwargs: threshold_sweep_table(fields(), *args, **kwargs)
+    return classify_fn
+
+
+def _threshold_values(spec):
+    """'a:b:n' -> linspace(a, b, n); 'x,y,...' -> listed values"""
+    if ':' in spec:
+        lo, hi, n = spec.split(':')
+        return np.linspace(float(lo), float(hi), int(n))
+    return np.array([float(v) for v in spec.split(',')])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-apply BFIP thresholds to a stored sweep')
+    parser.add_argument('store', help='Result store with theta_mean / MI / dG columns')
+    parser.add_argument('--theta', default=str(THR_THETA), help="θ̄ thresholds: 'lo:hi:n' or 'a,b,...'")
+    parser.add_argument('--mi', default=str(THR_MI), help="MI thresholds: 'lo:hi:n' or 'a,b,...'")
+    parser.add_argument('--dG', default=None, help='ΔG cuts in kJ/mol (default -RT·ln2)')
+    parser.add_argument('--where', default=None, help='Row filter, e.g. "ion == \'Fe2+\'"')
+    parser.add_argument('--out', default=None, help='Write the pattern-count table to this CSV')
+    args = parser.parse_args()
+
+    table = lazy_classifier(args.store, args.where).table(
+        _threshold_values(args.theta), _threshold_values(args.mi),
+        None if args.dG is None else _threshold_values(args.dG))
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"Saved {len(table)} threshold combinations to {args.out}")
+    else:
+        print(table.to_string(index=False))
+
+if __name__ == '__main__':
+    main()
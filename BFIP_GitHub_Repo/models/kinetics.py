@@ -1,6 +1,60 @@
 import numpy as np
+from collections import namedtuple
 from scipy.integrate import odeint
 
+# value(t) -> L(t); integral(t0, t1) -> ∫ L dt over [t0, t1]. Both accept
+# scalars or arrays and broadcast against the profile's own parameters.
+LigandProfile = namedtuple('LigandProfile', ['value', 'integral'])
+
+def _profile(value, antiderivative):
+    return LigandProfile(value, lambda t0, t1: antiderivative(t1) - antiderivative(t0))
+
+def ramp_profile(t_start, t_end, L_start, L_end):
+    """Straight line through (t_start, L_start) and (t_end, L_end), extended beyond both ends"""
+    slope = (L_end - L_start) / (t_end - t_start)
+    return _profile(lambda t: L_start + slope * (np.asarray(t) - t_start),
+                    lambda t: L_start * np.asarray(t) + 0.5 * slope * (np.asarray(t) - t_start) ** 2)
+
+def sinusoid_profile(mean, amplitude, omega, phase=0.0):
+    """L(t) = mean + amplitude·sin(omega·t + phase)"""
+    return _profile(lambda t: mean + amplitude * np.sin(omega * np.asarray(t) + phase),
+                    lambda t: mean * np.asarray(t) - amplitude / omega * np.cos(omega * np.asarray(t) + phase))
+
+def step_profile(before, after, t_step):
+    """L(t) = before for t < t_step, after from t_step on"""
+    return _profile(lambda t: np.where(np.asarray(t) < t_step, before, after),
+                    lambda t: before * np.asarray(t) + (after - before) * np.maximum(np.asarray(t) - t_step, 0.0))
+
+def pulse_profile(base, height, t_on, t_off):
+    """L(t) = base + height on [t_on, t_off), base elsewhere"""
+    return _profile(lambda t: base + height * ((np.asarray(t) >= t_on) & (np.asarray(t) < t_off)),
+                    lambda t: base * np.asarray(t) + height * (np.clip(t, t_on, t_off) - t_on))
+
+def tabulated_profile(t_knots, L_knots):
+    """
+    Piecewise-linear profile through (t_knots, L_knots), extrapolated
+    linearly from the end segments (interp1d's fill_value="extrapolate").
+    """
+    t_knots = np.asarray(t_knots, dtype=float)
+    L_knots = np.asarray(L_knots, dtype=float)
+    slopes = np.diff(L_knots) / np.diff(t_knots)
+    F_knots = np.concatenate(([0.0], np.cumsum(0.5 * (L_knots[1:] + L_knots[:-1]) * np.diff(t_knots))))
+
+    def segment(t):
+        t = np.asarray(t, dtype=float)
+        k = np.clip(np.searchsorted(t_knots, t, side='right') - 1, 0, len(slopes) - 1)
+        return k, t - t_knots[k]
+
+    def value(t):
+        k, dt = segment(t)
+        return L_knots[k] + slopes[k] * dt
+
+    def antiderivative(t):
+        k, dt = segment(t)
+        return F_knots[k] + L_knots[k] * dt + 0.5 * slopes[k] * dt ** 2
+
+    return _profile(value, antiderivative)
+
 def hill_equation(ligand, n_H, K_d):
     return ligand**n_H / (K_d**n_H + ligand**n_H)
 
@@ -9,9 +63,10 @@ def binding_dynamics(theta, t, ligand_func, k_on, k_off):
     return k_on * conc * (1 - theta) - k_off * theta
 
 def dynamic_ligand_base(base, amp, period=100):
+    drive = sinusoid_profile(0.0, amp, 2*np.pi/period)
     def fn(t, θ):
         feedback = θ*(1-θ)
-        return base*(1 + amp*np.sin(2*np.pi*t/period)*feedback)
+        return base*(1 + drive.value(t)*feedback)
     return fn
 
 
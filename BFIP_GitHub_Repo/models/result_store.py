@@ -0,0 +1,441 @@
+# ion_phase_lab/models/result_store.py
+"""
+Columnar result store for sweep outputs.
+
+A store is a directory (conventionally `<name>.bfipstore/`) holding
+- meta.json: column dtypes, parameter axes, run metadata and, per part,
+  its row count and column statistics (min/max, small value sets)
+- part-NNNNN.parquet or part-NNNNN.npz: compressed column chunks
+
+Writes are chunked and appends add parts, so large sweeps never have to be
+held or rewritten in one piece. Reads load only the columns they need and
+skip whole parts whose statistics cannot satisfy the `where` predicate,
+e.g. read_results(path, where="ion == 'Fe2+' and bfip").
+
+Parquet (pandas + pyarrow) is used when available; otherwise parts are
+compressed NPZ. Both engines read back identically.
+"""
+import ast
+import importlib.util
+import json
+import os
+import time
+
+import numpy as np
+
+STORE_FORMAT = 'bfip-result-store'
+STORE_VERSION = 1
+DEFAULT_CHUNK_ROWS = 1 << 16
+MAX_TRACKED_VALUES = 64   # string/bool columns keep their value set up to this size
+
+
+def _meta_path(path):
+    return os.path.join(path, 'meta.json')
+
+
+def _jsonable(x):
+    if isinstance(x, dict):
+        return {str(k): _jsonable(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return [_jsonable(v) for v in x]
+    if isinstance(x, np.ndarray):
+        return _jsonable(x.tolist())
+    if isinstance(x, np.generic):
+        return x.item()
+    if isinstance(x, float) and not np.isfinite(x):
+        return None
+    return x
+
+
+def _write_json(path, obj):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(_jsonable(obj), f, indent=1)
+    os.replace(tmp, path)
+
+
+def _resolve_engine(engine):
+    if engine == 'auto':
+        return 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'npz'
+    if engine not in ('parquet', 'npz'):
+        raise ValueError(f"Unknown engine '{engine}' (expected 'auto', 'parquet' or 'npz')")
+    if engine == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        raise ImportError("engine='parquet' requires pyarrow; use engine='npz' or 'auto'")
+    return engine
+
+
+def _as_columns(columns):
+    """Dict (or DataFrame) of equal-length 1-D columns -> dict of numpy arrays"""
+    if hasattr(columns, 'to_dict') and hasattr(columns, 'columns'):
+        columns = {c: columns[c].to_numpy() for c in columns.columns}
+    cols = {}
+    for name, values in columns.items():
+        arr = np.asarray(values)
+        if arr.dtype == object:
+            arr = arr.astype(str)
+        cols[str(name)] = arr.ravel()
+    lengths = {len(v) for v in cols.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: { {k: len(v) for k, v in cols.items()} }")
+    return cols
+
+
+def _column_stats(arr):
+    if arr.dtype.kind in 'biuf' and arr.size:
+        finite = arr[np.isfinite(arr)] if arr.dtype.kind == 'f' else arr
+        stats = {}
+        if finite.size:
+            stats = {'min': finite.min(), 'max': finite.max()}
+        if arr.dtype.kind == 'b':
+            stats['values'] = np.unique(arr)
+        return stats
+    if arr.dtype.kind in 'US' and arr.size:
+        values = np.unique(arr)
+        return {'values': values} if len(values) <= MAX_TRACKED_VALUES else {}
+    return {}
+
+
+def _write_part(path, engine, index, cols):
+    name = f"part-{index:05d}.{'parquet' if engine == 'parquet' else 'npz'}"
+    target = os.path.join(path, name)
+    tmp = target + '.tmp'
+    if engine == 'parquet':
+        import pandas as pd
+        pd.DataFrame(cols).to_parquet(tmp, engine='pyarrow', compression='zstd', index=False)
+    else:
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **cols)
+    os.replace(tmp, target)
+    return {'file': name, 'n_rows': len(next(iter(cols.values()))),
+            'stats': {c: _column_stats(v) for c, v in cols.items()}}
+
+
+def _read_part(path, engine, part, names):
+    target = os.path.join(path, part['file'])
+    if engine == 'parquet':
+        import pandas as pd
+        frame = pd.read_parquet(target, columns=list(names))
+        return {c: frame[c].to_numpy() for c in names}
+    with np.load(target) as z:
+        return {c: z[c] for c in names}
+
+
+def _clear_store(path):
+    """
+    Empty directory for a new store at `path`: an existing store loses its
+    parts, a missing directory is created, and any other non-empty
+    directory is refused rather than cleared.
+    """
+    if os.path.exists(_meta_path(path)):
+        store_info(path)     # raises ValueError unless meta.json is a result store
+        for name in os.listdir(path):
+            if name.startswith('part-'):
+                os.remove(os.path.join(path, name))
+    elif os.path.isdir(path) and os.listdir(path):
+        raise ValueError(f"{path} is a non-empty directory but not a {STORE_FORMAT}; "
+                         f"refusing to overwrite it")
+    else:
+        os.makedirs(path, exist_ok=True)
+
+
+def write_results(path, columns, axes=None, metadata=None, append=False,
+                  engine='auto', chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Write (or append) rows to the store at `path`.
+
+    Inputs:
+    - columns: dict of equal-length 1-D arrays (or a pandas DataFrame)
+    - axes: optional dict of parameter axes (e.g. {'dH': H_vals, 'dS': S_vals})
+    - metadata: optional JSON-serialisable run description
+    - append: add rows to an existing store (same column names) instead of
+      replacing it; axes/metadata given here are merged into the stored ones
+    - engine: 'auto', 'parquet' or 'npz' (ignored on append)
+    - chunk_rows: maximum rows per part file
+    """
+    cols = _as_columns(columns)
+    now = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    if append and os.path.exists(_meta_path(path)):
+        meta = store_info(path, raw=True)
+        if set(cols) != set(meta['columns']):
+            raise ValueError(f"Column mismatch on append: store has {sorted(meta['columns'])}, "
+                             f"got {sorted(cols)}")
+        meta['axes'].update(axes or {})
+        meta['metadata'].update(metadata or {})
+    else:
+        _clear_store(path)
+        meta = {
+            'format': STORE_FORMAT,
+            'version': STORE_VERSION,
+            'engine': _resolve_engine(engine),
+            'columns': {c: v.dtype.str for c, v in cols.items()},
+            'axes': dict(axes or {}),
+            'metadata': dict(metadata or {}),
+            'created': now,
+            'parts': [],
+        }
+
+    n_rows = len(next(iter(cols.values()))) if cols else 0
+    for start in range(0, n_rows, chunk_rows):
+        chunk = {c: v[start:start + chunk_rows] for c, v in cols.items()}
+        meta['parts'].append(_write_part(path, meta['engine'], len(meta['parts']), chunk))
+    meta['n_rows'] = sum(p['n_rows'] for p in meta['parts'])
+    meta['updated'] = now
+    _write_json(_meta_path(path), meta)
+    return meta['n_rows']
+
+
+def append_results(path, columns, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+    """Append rows to an existing store (or create it); see write_results"""
+    return write_results(path, columns, append=True, chunk_rows=chunk_rows, **kwargs)
+
+
+def store_info(path, raw=False):
+    """
+    Store description: engine, column dtypes, row count, metadata and axes
+    (as numpy arrays unless raw=True).
+    """
+    with open(_meta_path(path)) as f:
+        meta = json.load(f)
+    if meta.get('format') != STORE_FORMAT:
+        raise ValueError(f"{path} is not a {STORE_FORMAT}")
+    if not raw:
+        meta['axes'] = {k: np.asarray(v) for k, v in meta['axes'].items()}
+    return meta
+
+
+# --- predicates -------------------------------------------------------------
+
+_COMPARE = {
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+    ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Gt: np.greater, ast.GtE: np.greater_equal,
+}
+_ARITH = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply,
+          ast.Div: np.divide, ast.Pow: np.power}
+
+
+def _parse_where(where):
+    try:
+        return ast.parse(where, mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid where predicate {where!r}: {e}") from None
+
+
+def _where_columns(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and n.id not in ('True', 'False')}
+
+
+def _value(node, cols):
+    if isinstance(node, ast.Name):
+        return cols[node.id]
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_value(e, cols) for e in node.elts]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_value(node.operand, cols)
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITH:
+        return _ARITH[type(node.op)](_value(node.left, cols), _value(node.right, cols))
+    return _mask(node, cols)
+
+
+def _mask(node, cols):
+    if isinstance(node, ast.BoolOp):
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        out = _mask(node.values[0], cols)
+        for v in node.values[1:]:
+            out = combine(out, _mask(v, cols))
+        return out
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return np.logical_not(_mask(node.operand, cols))
+    if isinstance(node, ast.Compare):
+        out = True
+        left = _value(node.left, cols)
+        for op, comp in zip(node.ops, node.comparators):
+            right = _value(comp, cols)
+            if isinstance(op, (ast.In, ast.NotIn)):
+                hit = np.isin(left, right)
+                res = hit if isinstance(op, ast.In) else ~hit
+            elif type(op) in _COMPARE:
+                res = _COMPARE[type(op)](left, right)
+            else:
+                raise ValueError(f"Unsupported comparison {type(op).__name__} in where predicate")
+            out = np.logical_and(out, res)
+            left = right
+        return out
+    if isinstance(node, (ast.Name, ast.Constant)):
+        return np.asarray(_value(node, cols), dtype=bool)
+    raise ValueError(f"Unsupported expression {ast.dump(node)} in where predicate")
+
+
+def _pair_may_match(name, op, const, stats):
+    st = stats.get(name, {})
+    try:
+        if 'values' in st:
+            values = np.asarray(st['values'])
+            if isinstance(op, (ast.In, ast.NotIn)):
+                hit = np.isin(values, const)
+                return bool(np.any(hit if isinstance(op, ast.In) else ~hit))
+            return bool(np.any(_COMPARE[type(op)](values, const)))
+        if 'min' in st:
+            lo, hi = st['min'], st['max']
+            if isinstance(op, ast.Eq):
+                return lo <= const <= hi
+            if isinstance(op, ast.In):
+                return any(lo <= c <= hi for c in const)
+            if isinstance(op, ast.Lt):
+                return lo < const
+            if isinstance(op, ast.LtE):
+                return lo <= const
+            if isinstance(op, ast.Gt):
+                return hi > const
+            if isinstance(op, ast.GtE):
+                return hi >= const
+    except (TypeError, KeyError):
+        pass
+    return True
+
+
+def _may_match(node, stats):
+    """Conservative part-level test: False only if no row can satisfy node"""
+    _flip = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE,
+             ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+    if isinstance(node, ast.BoolOp):
+        results = [_may_match(v, stats) for v in node.values]
+        return all(results) if isinstance(node.op, ast.And) else any(results)
+    if isinstance(node, ast.Name):
+        # truthiness is only decidable from an explicit value set
+        values = stats.get(node.id, {}).get('values')
+        return values is None or any(bool(v) for v in values)
+    if isinstance(node, ast.Compare):
+        operands = [node.left] + list(node.comparators)
+        for (a, b), op in zip(zip(operands[:-1], operands[1:]), node.ops):
+            try:
+                if isinstance(a, ast.Name) and not _where_columns(b):
+                    ok = _pair_may_match(a.id, op, _value(b, {}), stats)
+                elif isinstance(b, ast.Name) and not _where_columns(a) and type(op) in _flip:
+                    ok = _pair_may_match(b.id, _flip[type(op)](), _value(a, {}), stats)
+                else:
+                    ok = True
+            except KeyError:
+                ok = True
+            if not ok:
+                return False
+    return True
+
+
+# --- reads --------------------------------------------------------------------
+
+def iter_results(path, where=None, columns=None):
+    """
+    Yield one dict of column arrays per part that survives the predicate,
+    already filtered row-wise. Lets callers stream stores larger than RAM.
+    """
+    meta = store_info(path, raw=True)
+    names = list(columns) if columns is not None else list(meta['columns'])
+    node = _parse_where(where) if where else None
+    needed = list(dict.fromkeys(names + sorted(_where_columns(node) if node is not None else [])))
+    unknown = set(needed) - set(meta['columns'])
+    if unknown:
+        raise ValueError(f"Unknown column(s) {sorted(unknown)} in {path}")
+
+    for part in meta['parts']:
+        if node is not None and not _may_match(node, part['stats']):
+            continue
+        cols = _read_part(path, meta['engine'], part, needed)
+        if node is not None:
+            keep = np.broadcast_to(_mask(node, cols), (part['n_rows'],))
+            cols = {c: v[keep] for c, v in cols.items()}
+        yield {c: cols[c] for c in names}
+
+
+def read_results(path, where=None, columns=None, as_frame=False):
+    """
+    Load the rows matching `where` (a Python-syntax boolean expression over
+    column names, e.g. "ion == 'Fe2+' and bfip", "MI > 2.2 and T in (305, 310)").
+
+    Only the requested columns plus those named in the predicate are read,
+    and parts whose statistics rule the predicate out are skipped. Returns a
+    dict of arrays, or a pandas DataFrame with as_frame=True.
+    """
+    meta = store_info(path, raw=True)
+    names = list(columns) if columns is not None else list(meta['columns'])
+    chunks = list(iter_results(path, where, names))
+    if chunks:
+        out = {c: np.concatenate([ch[c] for ch in chunks]) for c in names}
+    else:
+        out = {c: np.empty(0, dtype=np.dtype(meta['columns'][c])) for c in names}
+    if as_frame:
+        import pandas as pd
+        return pd.DataFrame(out)
+    return out
+
+
+# --- grids ----------------------------------------------------------------------
+
+def grid_columns(axes, **fields):
+    """
+    Flatten fields defined on the product of `axes` into store columns.
+
+    axes is an ordered dict {name: 1-D values}; each field has shape
+    tuple(len(v) for v in axes.values()) (indexing='ij'). Returns the axis
+    coordinate columns followed by the raveled fields.
+    """
+    grids = np.meshgrid(*[np.asarray(v) for v in axes.values()], indexing='ij')
+    cols = {name: g.ravel() for name, g in zip(axes, grids)}
+    shape = grids[0].shape if grids else ()
+    for name, field in fields.items():
+        cols[name] = np.broadcast_to(np.asarray(field), shape).ravel()
+    return cols
+
+
+def read_grid(path, field, where=None, fill=np.nan):
+    """
+    Rebuild `field` on the store's axes (inverse of grid_columns). Rows may
+    arrive in any order or across appended parts. A complete grid keeps the
+    column's dtype; otherwise cells with no row get fill.
+    """
+    axes = store_info(path)['axes']
+    cols = read_results(path, where, list(axes) + [field])
+    values = cols[field]
+    shape = tuple(len(v) for v in axes.values())
+    index = []
+    for name, ax in axes.items():
+        sorter = np.argsort(ax)
+        index.append(sorter[np.searchsorted(ax, cols[name], sorter=sorter)])
+    index = tuple(index)
+    seen = np.zeros(shape, dtype=bool)
+    seen[index] = True
+    dtype = values.dtype if seen.all() else np.result_type(values.dtype, np.asarray(fill).dtype)
+    out = np.full(shape, fill if not seen.all() else 0, dtype=dtype)
+    out[index] = values
+    return out
+
+
+def import_csv(csv_path, path, chunk_rows=DEFAULT_CHUNK_ROWS, metadata=None, engine='auto', **read_csv_kwargs):
+    """
+    Convert a CSV file into a store, streaming it chunk by chunk with pandas.
+    Column names are taken from the header (non-identifier characters such as
+    '*' are replaced by '_star' / '_' so they can be used in predicates).
+    """
+    import pandas as pd
+
+    def clean(name):
+        name = str(name).strip().replace('*', '_star')
+        return ''.join(ch if ch.isalnum() or ch == '_' else '_' for ch in name)
+
+    meta = dict(metadata or {}, source=os.path.abspath(csv_path))
+    n_rows = 0
+    for k, frame in enumerate(pd.read_csv(csv_path, chunksize=chunk_rows, **read_csv_kwargs)):
+        frame.columns = [clean(c) for c in frame.columns]
+        n_rows = write_results(path, frame, metadata=meta, append=k > 0,
+                               engine=engine, chunk_rows=chunk_rows)
+    return n_rows
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,134 @@
 # bfip/sampling.py
+import warnings
+
 import numpy as np
+from scipy import stats
+from scipy.stats import qmc
+
+PARAM_KEYS = ["K_d", "k_on", "k_off", "Delta_H", "Delta_S"]
+METHODS = ('random', 'sobol', 'halton', 'lhs')
+DISTRIBUTIONS = ('normal', 'truncnorm', 'lognormal')
+DEFAULT_CHUNK = 1 << 16
 
-def sample_parameters(param_dict, n_samples):
+
+def unit_design(n, d, method='random', rng=None, engine=None):
     """
-    Sample kinetic and thermodynamic parameters from normal distributions.
+    n points in the open unit cube (0, 1)^d.
+
+    - 'random': i.i.d. uniforms from rng
+    - 'sobol' / 'halton': scrambled low-discrepancy sequences (Sobol' is best
+      balanced when n is a power of two)
+    - 'lhs': a Latin hypercube of n strata per axis
+
+    Pass engine (from make_engine) to continue a Sobol'/Halton sequence across
+    calls; rng is a seed or np.random.Generator.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown sampling method '{method}' (expected one of {METHODS})")
+    rng = np.random.default_rng(rng)
+    if method == 'random':
+        U = rng.random((n, d))
+    else:
+        engine = engine if engine is not None else make_engine(method, d, rng)
+        with warnings.catch_warnings():
+            # Sobol' warns for n that is not a power of two; chunked streams are fine
+            warnings.simplefilter('ignore', UserWarning)
+            U = engine.random(n)
+    # keep inverse CDFs finite
+    return np.clip(U, np.finfo(float).tiny, 1 - np.finfo(float).epsneg)
+
+
+def make_engine(method, d, rng=None):
+    """scipy.stats.qmc engine for a design method ('random' has none)"""
+    if method == 'random':
+        return None
+    rng = np.random.default_rng(rng)
+    if method == 'sobol':
+        return qmc.Sobol(d, scramble=True, seed=rng)
+    if method == 'halton':
+        return qmc.Halton(d, scramble=True, seed=rng)
+    if method == 'lhs':
+        return qmc.LatinHypercube(d, seed=rng)
+    raise ValueError(f"Unknown sampling method '{method}' (expected one of {METHODS})")
+
+
+def _marginal(stats_dict, dist):
+    """
+    Frozen scipy distribution for one parameter's mean/std (+ optional
+    bounds); a std of 0 gives the mean itself, sampled as a constant column
+    """
+    mean = float(stats_dict["mean"])
+    std = float(stats_dict["std"])
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{dist}' (expected one of {DISTRIBUTIONS})")
+    if std == 0:
+        return mean
+    if dist == 'normal':
+        return stats.norm(mean, std)
+    if dist == 'truncnorm':
+        # truncated at 0 unless explicit lower/upper bounds are given
+        lower = float(stats_dict.get("lower", 0.0))
+        upper = float(stats_dict.get("upper", np.inf))
+        return stats.truncnorm((lower - mean) / std, (upper - mean) / std, loc=mean, scale=std)
+    if dist == 'lognormal':
+        if mean <= 0:
+            raise ValueError("lognormal parameters need a positive mean")
+        # moment-matched: same mean and std as the normal spec
+        sigma2 = np.log1p((std / mean) ** 2)
+        return stats.lognorm(np.sqrt(sigma2), scale=mean * np.exp(-sigma2 / 2))
+    raise ValueError(f"Unknown distribution '{dist}' (expected one of {DISTRIBUTIONS})")
+
+
+def _marginals(param_dict, keys, distributions):
+    distributions = distributions or {}
+    marginals = []
+    for key in keys:
+        spec = param_dict.get(key)
+        if spec is None or "mean" not in spec or "std" not in spec:
+            raise ValueError(f"Missing or malformed stats for '{key}' in config.yaml")
+        marginals.append(_marginal(spec, spec.get("dist", distributions.get(key, 'normal'))))
+    return marginals
+
+
+def iter_parameter_samples(param_dict, n_samples, chunk_size=DEFAULT_CHUNK, method='random',
+                           seed=None, distributions=None, keys=PARAM_KEYS):
+    """
+    Stream sample_parameters output in chunks of at most chunk_size rows.
+
+    Sobol'/Halton chunks continue one sequence, so the concatenated stream
+    equals a single draw of n_samples points; with 'lhs' each chunk is its
+    own Latin hypercube.
+    """
+    marginals = _marginals(param_dict, keys, distributions)
+    rng = np.random.default_rng(seed)
+    engine = make_engine(method, len(keys), rng) if method != 'lhs' else None
+    for start in range(0, n_samples, chunk_size):
+        n = min(chunk_size, n_samples - start)
+        U = unit_design(n, len(keys), method, rng, engine)
+        yield {key: np.full(n, dist) if isinstance(dist, float) else dist.ppf(U[:, k])
+               for k, (key, dist) in enumerate(zip(keys, marginals))}
+
+
+def sample_parameters(param_dict, n_samples, method='random', seed=None, distributions=None,
+                      keys=PARAM_KEYS, chunk_size=DEFAULT_CHUNK):
+    """
+    Sample kinetic and thermodynamic parameters.
     Expects param_dict to have nested dicts for keys “K_d”, “k_on”, “k_off”, “Delta_H”, “Delta_S”,
     each with “mean” and “std” entries.
     Returns a dict mapping those keys to length-n_samples numpy arrays.
+
+    - method: 'random' (i.i.d.), 'sobol', 'halton' or 'lhs'; the design is
+      mapped through each marginal's inverse CDF
+    - seed: int or np.random.Generator (None draws fresh entropy)
+    - distributions: per-key 'normal' (default), 'truncnorm' (at 0, or at
+      the spec's lower/upper) or 'lognormal' (moment-matched); a "dist"
+      entry in a key's stats overrides it
     """
-    samples = {}
-    param_keys = ["K_d", "k_on", "k_off", "Delta_H", "Delta_S"]
-    for key in param_keys:
-        stats = param_dict.get(key)
-        if stats is None or "mean" not in stats or "std" not in stats:
-            raise ValueError(f"Missing or malformed stats for '{key}' in config.yaml")
-        mean = float(stats["mean"])
-        std  = float(stats["std"])
-        samples[key] = np.random.normal(mean, std, size=n_samples)
-    return samples
+    chunks = list(iter_parameter_samples(param_dict, n_samples, chunk_size, method, seed,
+                                         distributions, keys))
+    if not chunks:
+        return {key: np.empty(0) for key in keys}
+    return {key: np.concatenate([c[key] for c in chunks]) for key in keys}
 
 
 def main():
@@ -0,0 +1,74 @@
+# ion_phase_lab/models/signals.py
+import numpy as np
+from scipy.signal import fftconvolve
+
+# Below this many samples np.correlate's direct O(N·M) sum beats the FFT
+FFT_THRESHOLD = 2048
+
+
+def cross_correlate(a, v, mode='same', fft_threshold=FFT_THRESHOLD):
+    """
+    Drop-in replacement for np.correlate(a, v, mode) on real 1-D signals.
+
+    Uses the direct sum for short inputs and an O(N log N) FFT convolution
+    once the shorter input reaches fft_threshold samples. Both paths return
+    the same lags (up to float round-off).
+    """
+    a = np.asarray(a, dtype=float)
+    v = np.asarray(v, dtype=float)
+    if min(a.size, v.size) < fft_threshold:
+        return np.correlate(a, v, mode=mode)
+    if mode == 'same' and v.size > a.size:
+        # np.correlate centres 'same' on the longer input
+        return fftconvolve(v, a[::-1], mode='same')[::-1]
+    return fftconvolve(a, v[::-1], mode=mode)
+
+
+def mutual_info_proxy(I, O, fft_threshold=FFT_THRESHOLD):
+    """
+    Cross-correlation MI proxy used by the Tier 8–19 scripts:
+    centred 'same'-mode correlation of input and output, divided by len(I).
+    """
+    I = np.asarray(I, dtype=float)
+    O = np.asarray(O, dtype=float)
+    return cross_correlate(I - np.mean(I), O - np.mean(O), 'same', fft_threshold) / len(I)
+
+
+def rolling_sum(x, window, fill=np.nan):
+    """
+    Trailing-window sums s[i] = sum(x[i-window:i]) in one cumulative-sum pass.
+
+    Entries before a full window exists (i < window) are set to fill, so
+    threshold tests on them are False when fill is NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    csum = np.concatenate(([0.0], np.cumsum(x)))
+    out = np.full(x.shape, fill, dtype=float)
+    out[window:] = csum[window:-1] - csum[:-window - 1]
+    return out
+
+
+def rolling_mean(x, window, fill=np.nan):
+    """Trailing-window means m[i] = mean(x[i-window:i]); see rolling_sum"""
+    return rolling_sum(x, window, fill) / window
+
+
+def oscillator(t, freq, phase=0.0):
+    """Rectified carrier (sin(2π·f·t + φ) + 1) / 2; freq and phase may be arrays"""
+    return (np.sin(2 * np.pi * freq * np.asarray(t) + phase) + 1) / 2
+
+
+def threshold_gate(level, threshold, carrier, gain=1.0):
+    """
+    Vectorised form of the tier gates' inner step:
+    out[i] = carrier[i] · level[i] · gain where level[i] > threshold, else 0.
+    """
+    level = np.asarray(level, dtype=float)
+    return np.where(level > threshold, carrier * level * gain, 0.0)
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
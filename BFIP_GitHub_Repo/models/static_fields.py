@@ -0,0 +1,100 @@
+# ion_phase_lab/models/static_fields.py
+"""
+Broadcast evaluation of the static BFIP fields used by the contour explorers.
+
+Every cell of a parameter mesh gets
+- θ*  = hill_equation(L, n_H, K_d)
+- ΔG  = gibbs_free_energy(θ*, ΔH, ΔS, T)
+- MI  = the two-point MI of P = (1-θ*, θ*) against its perturbed copy
+        Q = (1-θ*(1+p), θ*(1+p)), exactly as compute_mutual_information
+        scores np.outer(P, Q)
+- bfip = θ* > thr_theta and MI > thr_mi and ΔG < -n·RT·ln2
+with array operations instead of per-cell Python calls. Meshes of any
+dimension are evaluated in slabs along the first axis, so temporaries stay
+bounded however fine the grid is.
+"""
+import numpy as np
+
+from .kinetics import hill_equation
+from .thermodynamics import gibbs_free_energy
+from .information import compute_mutual_information
+from .classifier import dG_threshold
+
+INPUTS = ('L', 'K_d', 'n_H', 'dH', 'dS', 'T')
+CHUNK_CELLS = 1 << 20     # cells per slab
+
+
+def two_point_mi(theta, perturb, eps=1e-12):
+    """
+    compute_mutual_information(np.outer(P, Q), P, Q) for every θ in an array
+    (bits, clipped at 0), with P, Q the two-point distributions above.
+    """
+    theta = np.asarray(theta, dtype=float)
+    P = np.stack([1 - theta, theta], axis=-1)
+    Q = np.stack([1 - theta * (1 + perturb), theta * (1 + perturb)], axis=-1)
+    return compute_mutual_information(P[..., :, None] * Q[..., None, :], P, Q, eps)
+
+
+def static_fields(L, K_d, n_H, dH, dS, T, mi_perturb=0.10):
+    """θ*, ΔG and two-point MI for broadcastable parameter arrays"""
+    theta = hill_equation(np.asarray(L, dtype=float), n_H, np.asarray(K_d, dtype=float))
+    return {
+        'theta_mean': theta,
+        'dG': gibbs_free_energy(theta, dH, dS, T),
+        'MI': two_point_mi(theta, mi_perturb),
+    }
+
+
+def evaluate_mesh(axes, params, thr_theta, thr_mi, n_RTln2=1.0, mi_perturb=0.10,
+                  chunk_cells=CHUNK_CELLS):
+    """
+    Static fields and BFIP mask over the mesh spanned by `axes`.
+
+    - axes: {name: 1-D values}; the result is indexed in this order
+      (like meshgrid(..., indexing='ij'))
+    - params: one entry per model input (L, K_d, n_H, dH, dS, T), each a
+      scalar or the name of an axis; one axis may feed several inputs (e.g.
+      L and K_d both from 'K_d'), and axes feeding none simply broadcast
+
+    Returns a dict of full-mesh arrays 'theta_mean', 'dG', 'MI' and 'bfip'
+    (field names as in models.classifier).
+    """
+    names = list(axes)
+    values = [np.asarray(axes[name], dtype=float) for name in names]
+    shape = tuple(len(v) for v in values)
+    missing = [k for k in INPUTS if k not in params]
+    if missing:
+        raise KeyError(f"evaluate_mesh needs values for {missing}")
+
+    def mesh_input(key, rows):
+        spec = params[key]
+        if not isinstance(spec, str):
+            return spec
+        k = names.index(spec)
+        v = values[k][rows] if k == 0 else values[k]
+        view = [1] * len(shape)
+        view[k] = len(v)
+        return v.reshape(view)
+
+    out = {name: np.empty(shape) for name in ('theta_mean', 'dG', 'MI')}
+    out['bfip'] = np.empty(shape, dtype=bool)
+    row_cells = int(np.prod(shape[1:], dtype=np.int64))
+    step = max(1, chunk_cells // max(row_cells, 1))
+    for start in range(0, shape[0], step):
+        rows = slice(start, start + step)
+        slab = (min(start + step, shape[0]) - start,) + shape[1:]
+        inputs = {key: mesh_input(key, rows) for key in INPUTS}
+        fields = static_fields(**inputs, mi_perturb=mi_perturb)
+        fields = {k: np.broadcast_to(v, slab) for k, v in fields.items()}
+        for k, v in fields.items():
+            out[k][rows] = v
+        out['bfip'][rows] = ((fields['theta_mean'] > thr_theta) & (fields['MI'] > thr_mi)
+                             & (fields['dG'] < dG_threshold(inputs['T'], n_RTln2)))
+    return out
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
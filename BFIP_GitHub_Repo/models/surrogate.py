@@ -0,0 +1,262 @@
+# ion_phase_lab/models/surrogate.py
+"""
+Gaussian-process emulator of the BFIP metrics for large parameter scans.
+
+θ̄, MI and ΔG are smooth in (ΔH, ΔS, amplitude, k_on, n_H) almost
+everywhere, so a GP fitted to a modest design of true simulations predicts
+them, with an uncertainty, at a small fraction of the cost. active_scan
+evaluates the true model only where the predicted BFIP bit is in doubt
+(near the phase boundary or where the GP is uncertain) and trusts the
+emulator elsewhere.
+
+Pure NumPy/SciPy: an anisotropic RBF kernel on the unit cube, hyperparameters
+by maximum marginal likelihood, and closed-form leave-one-out errors for
+cross-validation.
+"""
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from scipy.special import ndtr
+
+from .classifier import THR_THETA, THR_MI, METRICS, dG_threshold
+from .sampling import unit_design
+
+MAX_FIT_POINTS = 400     # hyperparameters are fitted on at most this many points
+PREDICT_CHUNK = 4096
+JITTER = 1e-10
+
+
+def _to_unit(X, bounds, log_axes):
+    """Map physical points to the unit cube; log_axes are scaled in log10"""
+    X = np.array(X, dtype=float, ndmin=2)
+    lo, hi = (np.array(b, dtype=float) for b in zip(*bounds))
+    for k in log_axes:
+        X[:, k] = np.log10(X[:, k])
+        lo[k], hi[k] = np.log10(lo[k]), np.log10(hi[k])
+    return (X - lo) / (hi - lo)
+
+
+def _from_unit(U, bounds, log_axes):
+    lo, hi = (np.array(b, dtype=float) for b in zip(*bounds))
+    lo_t, hi_t = lo.copy(), hi.copy()
+    for k in log_axes:
+        lo_t[k], hi_t[k] = np.log10(lo[k]), np.log10(hi[k])
+    X = lo_t + np.asarray(U) * (hi_t - lo_t)
+    for k in log_axes:
+        X[:, k] = 10.0 ** X[:, k]
+    return X
+
+
+def _rbf(A, B, length):
+    A = A / length
+    B = B / length
+    d2 = (A ** 2).sum(1)[:, None] + (B ** 2).sum(1)[None, :] - 2 * A @ B.T
+    return np.exp(-0.5 * np.maximum(d2, 0.0))
+
+
+def _neg_log_likelihood(log_params, U, y):
+    d = U.shape[1]
+    length = np.exp(log_params[:d])
+    sf2, sn2 = np.exp(log_params[d:])
+    K = sf2 * _rbf(U, U, length) + (sn2 + JITTER) * np.eye(len(y))
+    try:
+        c = cho_factor(K, lower=True)
+    except np.linalg.LinAlgError:
+        return 1e25
+    alpha = cho_solve(c, y)
+    return 0.5 * y @ alpha + np.log(np.diag(c[0])).sum()
+
+
+def fit_gp(U, y, noise=None, n_restarts=2, seed=0):
+    """
+    Fit a GP to points U in the unit cube and targets y (1-D).
+
+    Returns a model dict (length scales, signal/noise variance, Cholesky
+    factor and weights). noise fixes the standardised noise variance instead
+    of fitting it.
+    """
+    U = np.asarray(U, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, d = U.shape
+    y_mean = y.mean()
+    y_std = y.std() or 1.0
+    ys = (y - y_mean) / y_std
+
+    rng = np.random.default_rng(seed)
+    sub = rng.choice(n, MAX_FIT_POINTS, replace=False) if n > MAX_FIT_POINTS else np.arange(n)
+    log_noise = np.log(noise) if noise is not None else None
+    bounds = [(np.log(1e-2), np.log(1e1))] * d + [(np.log(1e-2), np.log(1e2)), (np.log(1e-10), 0.0)]
+    if log_noise is not None:
+        bounds[-1] = (log_noise, log_noise)
+
+    best = None
+    for k in range(n_restarts + 1):
+        start = np.concatenate([np.full(d, np.log(0.3)) if k == 0 else rng.uniform(np.log(0.05), np.log(2.0), d),
+                                [0.0, np.log(1e-4) if log_noise is None else log_noise]])
+        res = minimize(_neg_log_likelihood, start, args=(U[sub], ys[sub]), method='L-BFGS-B', bounds=bounds)
+        if best is None or res.fun < best.fun:
+            best = res
+
+    length = np.exp(best.x[:d])
+    sf2, sn2 = np.exp(best.x[d:])
+    K = sf2 * _rbf(U, U, length) + (sn2 + JITTER) * np.eye(n)
+    chol = cho_factor(K, lower=True)
+    return {
+        'U': U, 'length': length, 'sf2': sf2, 'sn2': sn2,
+        'chol': chol, 'alpha': cho_solve(chol, ys),
+        'y_mean': y_mean, 'y_std': y_std, 'y': y,
+    }
+
+
+def gp_predict(model, U, chunk=PREDICT_CHUNK):
+    """Posterior mean and standard deviation at unit-cube points U"""
+    U = np.asarray(U, dtype=float)
+    mean = np.empty(len(U))
+    std = np.empty(len(U))
+    for start in range(0, len(U), chunk):
+        Ks = model['sf2'] * _rbf(U[start:start + chunk], model['U'], model['length'])
+        mean[start:start + chunk] = Ks @ model['alpha']
+        v = cho_solve(model['chol'], Ks.T)
+        var = model['sf2'] - np.einsum('ij,ji->i', Ks, v)
+        std[start:start + chunk] = np.sqrt(np.maximum(var, 0.0))
+    return model['y_mean'] + model['y_std'] * mean, model['y_std'] * std
+
+
+def gp_loo(model):
+    """
+    Leave-one-out predictive mean and std at the training points, in closed
+    form from the inverse kernel matrix (no refits).
+    """
+    Kinv = cho_solve(model['chol'], np.eye(len(model['alpha'])))
+    diag = np.diag(Kinv)
+    ys = (model['y'] - model['y_mean']) / model['y_std']
+    mean = ys - model['alpha'] / diag
+    return model['y_mean'] + model['y_std'] * mean, model['y_std'] / np.sqrt(diag)
+
+
+def fit_emulator(X, metrics, bounds, log_axes=(), seed=0):
+    """
+    One GP per BFIP metric.
+
+    X: (n, d) physical points inside bounds ((lo, hi) per axis); metrics:
+    (n, 3) columns θ̄, MI, ΔG. Returns an emulator dict used by
+    emulator_predict / cross_validate / active_scan.
+    """
+    X = np.asarray(X, dtype=float)
+    metrics = np.asarray(metrics, dtype=float)
+    U = _to_unit(X, bounds, log_axes)
+    return {
+        'bounds': [tuple(b) for b in bounds], 'log_axes': tuple(log_axes),
+        'X': X, 'metrics': metrics,
+        'gps': [fit_gp(U, metrics[:, k], seed=seed) for k in range(metrics.shape[1])],
+    }
+
+
+def emulator_predict(emulator, X):
+    """Predicted (mean, std) of θ̄, MI, ΔG at physical points X, each (m, 3)"""
+    U = _to_unit(X, emulator['bounds'], emulator['log_axes'])
+    pred = [gp_predict(gp, U) for gp in emulator['gps']]
+    return np.column_stack([m for m, _ in pred]), np.column_stack([s for _, s in pred])
+
+
+def bfip_probability(mean, std, thr_theta=THR_THETA, thr_mi=THR_MI, thr_dG=None, T=300.0):
+    """
+    P(BFIP) under the GP posterior, treating the three metrics as
+    independent Gaussians. Zero-std entries reduce to a hard threshold.
+    """
+    thr_dG = dG_threshold(T) if thr_dG is None else thr_dG
+    std = np.maximum(std, 1e-300)
+    return (ndtr((mean[:, 0] - thr_theta) / std[:, 0])
+            * ndtr((mean[:, 1] - thr_mi) / std[:, 1])
+            * ndtr((thr_dG - mean[:, 2]) / std[:, 2]))
+
+
+def cross_validate(emulator, **thresholds):
+    """
+    Leave-one-out error of each metric GP and of the BFIP bit.
+
+    Returns a dict with per-metric 'rmse' and 'max_abs' (original units)
+    and 'bfip_agreement', the fraction of design points whose LOO-predicted
+    BFIP bit matches the true one.
+    """
+    loo = [gp_loo(gp) for gp in emulator['gps']]
+    mean = np.column_stack([m for m, _ in loo])
+    std = np.column_stack([s for _, s in loo])
+    err = mean - emulator['metrics']
+    truth = bfip_probability(emulator['metrics'], np.zeros_like(std), **thresholds) > 0.5
+    pred = bfip_probability(mean, std, **thresholds) > 0.5
+    return {
+        'rmse': dict(zip(METRICS, np.sqrt((err ** 2).mean(axis=0)))),
+        'max_abs': dict(zip(METRICS, np.abs(err).max(axis=0))),
+        'bfip_agreement': float((truth == pred).mean()),
+    }
+
+
+def latin_design(bounds, n, log_axes=(), seed=0):
+    """Latin-hypercube design of n physical points (log_axes sampled in log10)"""
+    U = unit_design(n, len(bounds), 'lhs', seed)
+    return _from_unit(U, bounds, log_axes)
+
+
+def active_scan(simulate, candidates, bounds, log_axes=(), n_init=64, batch=32, max_true=512,
+                p_tol=0.02, thresholds=None, seed=0, verbose=False):
+    """
+    Classify every candidate point with the emulator, refining it with true
+    simulations where the BFIP bit is uncertain.
+
+    - simulate: X (m, d) -> (m, 3) true θ̄, MI, ΔG
+    - candidates: (N, d) points to classify (N may be far larger than max_true)
+    - n_init: size of the initial Latin-hypercube design
+    - batch: true evaluations per refinement round, taken at the candidates
+      with the most uncertain bit, min(P, 1 - P) > p_tol
+    - max_true: total budget of true simulations
+    - thresholds: dict for bfip_probability (thr_theta, thr_mi, thr_dG, T)
+
+    Returns a dict with the candidates' 'mean'/'std' metrics (true values
+    where simulated), 'p_bfip', 'bfip', 'is_true' (candidate simulated),
+    the final 'emulator', its 'cv' report and 'n_true'.
+    """
+    thresholds = thresholds or {}
+    candidates = np.asarray(candidates, dtype=float)
+    X = latin_design(bounds, min(n_init, max_true), log_axes, seed)
+    Y = np.asarray(simulate(X), dtype=float)
+    is_true = np.zeros(len(candidates), dtype=bool)
+    true_metrics = np.zeros((len(candidates), Y.shape[1]))
+
+    while True:
+        emulator = fit_emulator(X, Y, bounds, log_axes, seed)
+        mean, std = emulator_predict(emulator, candidates)
+        mean[is_true], std[is_true] = true_metrics[is_true], 0.0
+        p = bfip_probability(mean, std, **thresholds)
+        doubt = np.minimum(p, 1 - p)
+        doubt[is_true] = 0.0
+        budget = max_true - len(X)
+        n_doubtful = int((doubt > p_tol).sum())
+        if verbose:
+            print(f"  surrogate: {len(X)} true runs, {n_doubtful} uncertain candidate(s)")
+        if n_doubtful == 0 or budget <= 0:
+            break
+        pick = np.argsort(doubt)[::-1][:min(batch, budget, n_doubtful)]
+        Y_new = np.asarray(simulate(candidates[pick]), dtype=float)
+        is_true[pick] = True
+        true_metrics[pick] = Y_new
+        X = np.vstack([X, candidates[pick]])
+        Y = np.vstack([Y, Y_new])
+
+    return {
+        'mean': mean, 'std': std, 'p_bfip': p, 'bfip': p > 0.5, 'is_true': is_true,
+        'emulator': emulator, 'cv': cross_validate(emulator, **thresholds), 'n_true': len(X),
+    }
+
+
+def format_cv(cv):
+    """One-line summary of a cross_validate report"""
+    rmse = ', '.join(f"{k} {v:.3g}" for k, v in cv['rmse'].items())
+    return f"surrogate LOO RMSE: {rmse}; BFIP bit agreement {cv['bfip_agreement']:.1%}"
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 import numpy as np
 from bfip.simulation import run_dynamic
+from bfip.result_store import write_results
 
 # Snakemake context
 ion = snakemake.wildcards.ion
@@ -15,33 +16,32 @@ amplitude = cfg["ions"][ion].get("amplitude", 1.0)
 # Load sampled params
 archive = np.load(snakemake.input.params)
 kinetic_names = ["K_d", "k_on", "k_off"]
-thermo_names = ["Delta_H", "Delta_S"]
 
 n_samples = archive[kinetic_names[0]].shape[0]
-samples = []
-for i in range(n_samples):
-    kp = {k: float(archive[k][i]) for k in kinetic_names}
-    kp["n_H"] = n_H
-    kp["amplitude"] = amplitude
-    tp = {k: float(archive[k][i]) for k in thermo_names}
-    samples.append((kp, tp))
+kp = {k: np.asarray(archive[k], dtype=float) for k in kinetic_names}
+kp["n_H"] = n_H
+kp["amplitude"] = amplitude
 
 # Pull ligand range spec directly from config
 ligand_range_spec = cfg["ions"][ion]["ligand_range"]
 
-# Run dynamic transitions
-theta_dynamics = []
-time_grid = None
-for kp, tp in samples:
-    t, theta_t = run_dynamic(kp, ligand_range_spec, T, t_span)
-    if time_grid is None:
-        time_grid = t
-    theta_dynamics.append(theta_t)
+# Run dynamic transitions for the whole ensemble in one vector ODE
+time_grid, theta_dynamics = run_dynamic(kp, ligand_range_spec, T, t_span)
 
 # Save output
-theta_dynamics = np.array(theta_dynamics)
+theta_dynamics = np.asarray(theta_dynamics).reshape(n_samples, -1)
 np.savez(snakemake.output[0], time=time_grid, theta=theta_dynamics)
 
+# Long-format (sample, time) copy in the columnar result store
+sample = np.repeat(np.arange(n_samples), len(time_grid))
+write_results(snakemake.output.store, {
+    "sample": sample,
+    "time": np.tile(np.asarray(time_grid, dtype=float), n_samples),
+    **{k: kp[k][sample] for k in kinetic_names},
+    "theta": theta_dynamics.ravel(),
+}, axes={"time": time_grid}, metadata={"ion": ion, "T": T, "n_H": n_H, "amplitude": amplitude,
+                                        "ligand_range": ligand_range_spec})
+
 
 def main():
     pass
@@ -19,13 +19,21 @@ try:
     ion_params = config["ions"][ion]
     logging.info(f"Ion parameters: {ion_params}")
 
-    # Number of Monte Carlo samples (fallback to 100 if not set in config)
-    n_samples = config.get("n_samples", 100)
-    logging.info(f"Number of samples: {n_samples}")
+    # Sampling design (fallback: 100 i.i.d. samples if not set in config)
+    sampling = config.get("sampling", {})
+    n_samples = sampling.get("n_samples", config.get("n_samples", 100))
+    method = sampling.get("method", "random")
+    seed = sampling.get("seed")
+    if seed is not None:
+        # distinct, reproducible stream per ion
+        seed = [seed, sorted(config["ions"]).index(ion)]
+    logging.info(f"Number of samples: {n_samples} ({method}, seed {seed})")
 
     # Generate the samples
     logging.info("Generating parameter samples")
-    samples = sample_parameters(ion_params, n_samples=n_samples)
+    samples = sample_parameters(ion_params, n_samples=n_samples, method=method, seed=seed,
+                                distributions=sampling.get("distributions"),
+                                chunk_size=sampling.get("chunk_size", 1 << 16))
     logging.info(f"Sampled parameters: {list(samples.keys())}")
 
     # Save as a single .npz
@@ -1,7 +1,30 @@
 #!/usr/bin/env python
 import numpy as np
 import logging
+import zipfile
 from bfip.kinetics import hill_equation
+from bfip.result_store import write_results
+
+
+def write_npz_chunked(path, arrays, chunk_rows):
+    """
+    Write an np.load-compatible .npz one row-chunk at a time.
+
+    arrays maps name -> (shape, fill) where fill(start, stop) returns rows
+    [start, stop) as float64. Each member is streamed straight into the
+    archive, so peak memory is one chunk rather than the full grid.
+    """
+    with zipfile.ZipFile(path, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for name, (shape, fill) in arrays.items():
+            with zf.open(name + ".npy", mode="w", force_zip64=True) as fp:
+                header = {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                          "fortran_order": False, "shape": shape}
+                np.lib.format.write_array_header_2_0(fp, header)
+                for start in range(0, shape[0], chunk_rows):
+                    stop = min(start + chunk_rows, shape[0])
+                    fp.write(np.ascontiguousarray(fill(start, stop), dtype=np.float64).tobytes())
+                    logging.info(f"{name}: wrote rows {stop}/{shape[0]} ({100 * stop / shape[0]:.0f}%)")
+
 
 # Set up logging
 logging.basicConfig(filename=snakemake.log[0], level=logging.INFO,
@@ -19,37 +42,59 @@ try:
     # Load the Monte Carlo samples
     logging.info(f"Loading params from {snakemake.input.params}")
     sampled = np.load(snakemake.input.params)
-    n_samples = sampled["K_d"].shape[0]
+    Kd = np.asarray(sampled["K_d"], dtype=float)
+    DH = np.asarray(sampled["Delta_H"], dtype=float)
+    DS = np.asarray(sampled["Delta_S"], dtype=float)
+    n_samples = Kd.shape[0]
     logging.info(f"Number of samples: {n_samples}")
 
     # Ligand axis and temperature
     lig_vals = np.linspace(*params["ligand_range"])
     T = cfg["T_range"][1]
-    logging.info(f"Ligand values: {lig_vals[:5]}... (first 5), Temperature: {T}")
-
-    # Allocate storage
-    theta_grid = np.zeros((n_samples, len(lig_vals)))
-    G_grid = np.zeros_like(theta_grid)
-    logging.info("Allocated theta_grid and G_grid")
+    nH = params["n_H"]["mean"]
+    logging.info(f"Ligand values: {lig_vals[:5]}... (first 5), Temperature: {T}, nH={nH}")
+    logging.info(f"K_d range: {Kd.min():.4g}–{Kd.max():.4g}, "
+                 f"Delta_H range: {DH.min():.4g}–{DH.max():.4g}, "
+                 f"Delta_S range: {DS.min():.4g}–{DS.max():.4g}")
 
-    # Static binding + free-energy calculation per sample
-    for i in range(n_samples):
-        Kd = float(sampled["K_d"][i])
-        nH = params["n_H"]["mean"]
-        DH = float(sampled["Delta_H"][i])
-        DS = float(sampled["Delta_S"][i])
-        logging.info(f"Sample {i}: Kd={Kd}, nH={nH}, Delta_H={DH}, Delta_S={DS}")
+    # Static binding + free-energy calculation, broadcast over (sample, ligand)
+    def theta_rows(start, stop):
+        return hill_equation(lig_vals[None, :], nH, Kd[start:stop, None])
 
-        theta = hill_equation(lig_vals, nH, Kd)
-        G = DH - T * DS * 0.001
+    def G_rows(start, stop):
+        G = DH[start:stop] - T * DS[start:stop] * 0.001
+        return np.broadcast_to(G[:, None], (stop - start, len(lig_vals)))
 
-        theta_grid[i] = theta
-        G_grid[i] = G
+    # Memory budget for the two (n_samples × n_ligand) float64 grids
+    mem_mb = getattr(snakemake.resources, "mem_mb", None) or 1024
+    row_bytes = 2 * len(lig_vals) * 8
+    chunk_rows = max(1, int(mem_mb * 2**20 // row_bytes))
 
-    # Save output (fix: use first index of snakemake.output)
     output_path = snakemake.output[0]
-    logging.info(f"Saving output to {output_path}")
-    np.savez(output_path, theta=theta_grid, G=G_grid)
+    if chunk_rows >= n_samples:
+        logging.info(f"Grid fits in {mem_mb} MB; computing in one broadcast")
+        theta_grid = theta_rows(0, n_samples)
+        G_grid = G_rows(0, n_samples)
+        logging.info(f"Saving output to {output_path}")
+        np.savez(output_path, theta=theta_grid, G=G_grid)
+    else:
+        logging.info(f"Grid exceeds {mem_mb} MB; streaming {chunk_rows}-row chunks to {output_path}")
+        shape = (n_samples, len(lig_vals))
+        write_npz_chunked(output_path, {"theta": (shape, theta_rows), "G": (shape, G_rows)}, chunk_rows)
+
+    # Long-format copy in the columnar result store, one sample chunk per append
+    store_path = snakemake.output.store
+    logging.info(f"Writing result store {store_path}")
+    for start in range(0, n_samples, chunk_rows):
+        stop = min(start + chunk_rows, n_samples)
+        sample = np.repeat(np.arange(start, stop), len(lig_vals))
+        write_results(store_path, {
+            "sample": sample,
+            "ligand": np.tile(lig_vals, stop - start),
+            "K_d": Kd[sample], "Delta_H": DH[sample], "Delta_S": DS[sample],
+            "theta": theta_rows(start, stop).ravel(),
+            "G": G_rows(start, stop).ravel(),
+        }, axes={"ligand": lig_vals}, metadata={"ion": ion, "T": T, "n_H": nH}, append=start > 0)
     logging.info("Simulation completed successfully")
 
 except Exception as e:
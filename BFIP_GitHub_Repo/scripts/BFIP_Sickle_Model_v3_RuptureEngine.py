@@ -2,9 +2,10 @@
 #!/usr/bin/env python3
 import os
 import time
+import argparse
 import numpy as np
-from scipy.integrate import solve_ivp
 import plotly.graph_objects as go
+from sickle_solvers import binding_rates, solve_grid, check_qss
 
 print("Working directory:", os.getcwd())
 
@@ -40,16 +41,10 @@ def gibbs_free_energy(theta, ΔH, ΔS, T):
 def binding_dynamics(t, y, conc, pH, PCO2, T, ion_type):
     theta, MI = y[0], y[1]
     theta = np.clip(theta, 0.0, 1.0)
-    ion = ions[ion_type]
     O2_level = o2_dynamics(t)
-    effective_ligand = conc * (1 - 0.7 * (1 - O2_level))
+    forward, k_off = binding_rates(MODEL, t, conc, pH, PCO2, T, ion_type)
 
-    k_on = ion['k_on']
-    k_off = ion['k_off'] * (
-        1 + 0.3 * PCO2 / 50 + 0.1 * (7.4 - pH)**2 + 0.02 * (T - 310.15)
-    )
-
-    dtheta_dt = k_on * effective_ligand * (1 - theta) - k_off * theta
+    dtheta_dt = forward * (1 - theta) - k_off * theta
 
     if O2_level < 0.3:
         dMI_dt = 0.04 * (1 - theta) * (1 - O2_level)
@@ -61,15 +56,38 @@ def binding_dynamics(t, y, conc, pH, PCO2, T, ion_type):
     MI = max(min(MI + dMI_dt, 1000), -100)
     return [dtheta_dt, MI]
 
-def simulate():
+def mi_terms(t, theta, MI, O2_level):
+    """MI channel of binding_dynamics on arrays: (dMI_dt, ∂/∂θ, ∂/∂MI) per branch"""
+    stress = O2_level < 0.3
+    decay_strength = np.where(theta > 0.85, 0.15, 0.05)
+    dMI_dt = np.where(stress, 0.04 * (1 - theta) * (1 - O2_level), -decay_strength * MI)
+    return dMI_dt, np.where(stress, -0.04 * (1 - O2_level), 0.0), np.where(stress, 0.0, -decay_strength)
+
+MODEL = {'ions': ions, 'o2_dynamics': o2_dynamics, 'binding_dynamics': binding_dynamics,
+         'mi_terms': mi_terms, 'mi_bounds': (-100, 1000)}
+
+def simulate(mode='radau', grid=None, ion_types=None):
+    """
+    Sweep each ion's (conc, pH) grid.
+
+    Inputs:
+    - mode: 'radau' (full stiff solve) or 'qss' (see solve_grid)
+    - grid: optional (n_conc, n_pH) overriding the configured point counts
+    - ion_types: subset of ions to sweep (default: all)
+    """
     T = 310.15
     t = np.linspace(0, 800, 400)
     PCO2 = 50
     results = {}
 
-    for ion_type in ions.keys():
-        concs = np.linspace(*ions[ion_type]['conc_range'])
-        pHs = np.linspace(*ions[ion_type]['pH_range'])
+    for ion_type in (ion_types or ions.keys()):
+        conc_range = ions[ion_type]['conc_range']
+        pH_range = ions[ion_type]['pH_range']
+        if grid is not None:
+            conc_range = (*conc_range[:2], grid[0])
+            pH_range = (*pH_range[:2], grid[1])
+        concs = np.linspace(*conc_range)
+        pHs = np.linspace(*pH_range)
 
         θ_grid = np.zeros((len(concs), len(pHs)))
         MI_grid = np.zeros((len(concs), len(pHs)))
@@ -77,14 +95,13 @@ def simulate():
         bfip_mask = np.zeros((len(concs), len(pHs)), dtype=bool)
         bfip_rupture_mask = np.zeros((len(concs), len(pHs)), dtype=bool)
 
+        y0 = [0.4, 10.0]
+        θ_final, MI_final = solve_grid(MODEL, concs, pHs, PCO2, T, ion_type, y0, t, mode)
+
         for i, c in enumerate(concs):
             for j, pH in enumerate(pHs):
-                y0 = [0.4, 10.0]
-                sol = solve_ivp(binding_dynamics, [0, 800], y0,
-                                args=(c, pH, PCO2, T, ion_type),
-                                t_eval=t, method='Radau', rtol=1e-9, atol=1e-12)
-                θ = sol.y[0][-1]
-                MI = max(min(sol.y[1][-1], 1000), -100)
+                θ = θ_final[i, j]
+                MI = max(min(MI_final[i, j], 1000), -100)
                 ΔG = gibbs_free_energy(θ, ions[ion_type]['Delta_H'], ions[ion_type]['Delta_S'], T)
 
                 current_BFIP = (θ > 0.3 and 10 < MI <= 90 and ΔG < -3000)
@@ -161,6 +178,20 @@ def plot(results):
         trace_fig.write_html(f"deltaG_vs_theta_trace_{ion_type}.html", include_plotlyjs='cdn', auto_open=False)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sickle BFIP (conc × pH) sweep")
+    parser.add_argument('--mode', choices=['radau', 'qss'], default='radau',
+                        help="full stiff Radau solve or the quasi-steady-state θ shortcut")
+    parser.add_argument('--grid', type=int, nargs=2, metavar=('N_CONC', 'N_PH'),
+                        help="override the configured grid resolution")
+    parser.add_argument('--ion', choices=list(ions.keys()), action='append',
+                        help="sweep only this ion (repeatable)")
+    parser.add_argument('--check', action='store_true',
+                        help="compare the QSS shortcut against full Radau before sweeping")
+    cli = parser.parse_args()
+
     start = time.time()
-    result = simulate()
+    if cli.check:
+        for ion_type in (cli.ion or ions.keys()):
+            check_qss(MODEL, ion_type)
+    result = simulate(cli.mode, cli.grid, cli.ion)
     plot(result)
@@ -1,24 +1,21 @@
 
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
+from sweep_executor import sweep_grid
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
+from models.classifier import METRICS, classify
+from models.result_store import write_results, grid_columns
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
-def test_bfip(dH, dS, amp=1.0, T0=300.0):
+def bfip_metrics(dH, dS, amp=1.0, T0=300.0):
+    """Raw (θ̄, MI, ΔG) of one cell; thresholds are applied by models.classifier"""
     t_span = np.linspace(0, 120.0, 300)
     kin_base = {'k_on': 1e5, 'amplitude': amp}
     _, theta_base = run_dynamic_thermo(kin_base, None, T0, t_span[:2], dH, dS, 1.0)
@@ -29,18 +26,25 @@ def test_bfip(dH, dS, amp=1.0, T0=300.0):
     theta_mean = np.mean(theta_base)
     mi = compute_mi(theta_base, theta_pert)
     dG = gibbs_free_energy(theta_mean, dH, dS, T0)
+    return theta_mean, mi, dG
 
-    is_bfip = (theta_mean > THR_THETA) and (mi > THR_MI) and (dG < -(R_gas * T0 / 1000) * np.log(2))
-    return int(is_bfip)
+def test_bfip(dH, dS, amp=1.0, T0=300.0):
+    theta_mean, mi, dG = bfip_metrics(dH, dS, amp, T0)
+    fields = {'theta_mean': theta_mean, 'MI': mi, 'dG': dG}
+    return int(classify(fields, THR_THETA, THR_MI, T=T0))
 
-def map_phase(dH_range=(-100, -30), dS_range=(-0.25, 0.00), step=2.5, amp=1.0):
+def map_phase(dH_range=(-100, -30), dS_range=(-0.25, 0.00), step=2.5, amp=1.0, workers=1, T0=300.0, store_path=None):
     dH_vals = np.arange(dH_range[0], dH_range[1] + step, step)
     dS_vals = np.arange(dS_range[0], dS_range[1] + step, step)
-    Z = np.zeros((len(dH_vals), len(dS_vals)), dtype=int)
-
-    for i, dH in enumerate(dH_vals):
-        for j, dS in enumerate(dS_vals):
-            Z[i, j] = test_bfip(dH, dS, amp)
+    cells = sweep_grid(bfip_metrics, dH_vals, dS_vals, workers=workers, amp=amp, T0=T0)
+    fields = dict(zip(METRICS, np.moveaxis(cells, -1, 0)))
+    Z = classify(fields, THR_THETA, THR_MI, T=T0).astype(int)
+    if store_path is not None:
+        # θ̄ / MI / ΔG fields; re-threshold with models.classifier.lazy_classifier(store_path)
+        axes = {'dH': dH_vals, 'dS': dS_vals}
+        write_results(store_path, grid_columns(axes, bfip=Z, **fields), axes=axes,
+                      metadata={'source': 'bfip_explore_Fe2_phase.py', 'amp': amp, 'T0': T0, 'MI_perturb': MI_PERTURB,
+                                'thresholds': {'theta': THR_THETA, 'MI': THR_MI}})
 
     return dH_vals, dS_vals, Z
 
@@ -58,5 +62,9 @@ def plot_map(dH_vals, dS_vals, Z):
     plt.show()
 
 if __name__ == '__main__':
-    dH_vals, dS_vals, Z = map_phase()
+    parser = argparse.ArgumentParser(description='Fe²⁺ BFIP activation map over ΔH–ΔS')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for the sweep (0 = all cores)')
+    parser.add_argument('--store', default=None, help='Also write the θ̄ / MI / ΔG fields to this result-store directory')
+    args = parser.parse_args()
+    dH_vals, dS_vals, Z = map_phase(workers=args.workers, store_path=args.store)
     plot_map(dH_vals, dS_vals, Z)
@@ -1,22 +1,16 @@
 
+import argparse
 import numpy as np
-from thermo_dynamic_model import run_dynamic_thermo
+from thermo_dynamic_model import run_dynamic_thermo_cached as run_dynamic_thermo
+from models.cache import configure_cache, format_stats
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def test_bfip(dH, dS, amp=0.50, T0=300.0):
     t_span = np.linspace(0, 120.0, 300)
     kin_base = {'k_on': 1e5, 'amplitude': amp}
@@ -62,9 +56,18 @@ def scan_for_bfip_targets():
     return found
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Search around the canonical points for active H⁺/Ca²⁺ pairs")
+    parser.add_argument('--cache', nargs='?', const='', default=None, metavar='DIR',
+                        help='Reuse run_dynamic_thermo results: in memory, or also on disk under DIR')
+    args = parser.parse_args()
+    if args.cache is not None:
+        configure_cache(args.cache or None)
+
     results = scan_for_bfip_targets()
     print("\n🎯 BFIP Active Pair Matches:")
     for label, logic, h_coords, ca_coords in results:
         print(f"• {label} → Logic: {logic}")
         print(f"  ➤ H⁺: {h_coords}")
         print(f"  ➤ Ca²⁺: {ca_coords}\n")
+    if args.cache is not None:
+        print(format_stats())
@@ -3,21 +3,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def generate_pulse_wave(t_span, low=0.10, high=0.30, period=60):
     pulse_wave = []
     for t in t_span:
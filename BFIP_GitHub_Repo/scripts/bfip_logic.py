@@ -1,40 +1,158 @@
-
 import numpy as np
+import pandas as pd
+
+from models.bitmask import load_mask, unpack_mask, is_mask_path, pattern_counts
+
+DEFAULT_IONS = ('H+', 'Ca2+', 'Fe2+')
+
+INTERPRETATIONS = {
+    0b000: "No BFIP activity — phase silent",
+    0b100: "Proton-driven logic: pH gating or charge relay",
+    0b010: "Scaffold memory / Ca²⁺ binding logic",
+    0b001: "Redox-encoded gate: Fe²⁺ electron logic",
+    0b110: "Dual signal: pH + structure memory",
+    0b101: "Acid-redox switch: dynamic electron flow control",
+    0b011: "Redox-structure pair: signal buffering or integrity check",
+    0b111: "Consensus phase: Bio-functional control node (high-order logic)"
+}
 
-def load_bfip_maps(h_path, ca_path, fe_path):
-    Z_H = np.load(h_path)
-    Z_Ca = np.load(ca_path)
-    Z_Fe = np.load(fe_path)
+def load_bfip_map(path, packed=False):
+    """
+    One ion's BFIP map from a .npy array or a packed .bfipmask directory
+    (models.bitmask). packed=True returns bit-packed masks memory-mapped,
+    as logic_map_table takes them.
+    """
+    if is_mask_path(path):
+        mask = load_mask(path)
+        return mask if packed else unpack_mask(mask)
+    if packed:
+        raise ValueError(f"{path} is not a packed mask directory")
+    return np.load(path)
+
+def load_bfip_maps(h_path, ca_path, fe_path, packed=False):
+    Z_H = load_bfip_map(h_path, packed)
+    Z_Ca = load_bfip_map(ca_path, packed)
+    Z_Fe = load_bfip_map(fe_path, packed)
     return Z_H, Z_Ca, Z_Fe
 
 def classify_bfip_region(h, ca, fe):
     pattern = (h << 2) | (ca << 1) | fe
-    interpretations = {
-        0b000: "No BFIP activity — phase silent",
-        0b100: "Proton-driven logic: pH gating or charge relay",
-        0b010: "Scaffold memory / Ca²⁺ binding logic",
-        0b001: "Redox-encoded gate: Fe²⁺ electron logic",
-        0b110: "Dual signal: pH + structure memory",
-        0b101: "Acid-redox switch: dynamic electron flow control",
-        0b011: "Redox-structure pair: signal buffering or integrity check",
-        0b111: "Consensus phase: Bio-functional control node (high-order logic)"
-    }
-    return pattern, interpretations.get(pattern, "Unknown pattern")
-
-def analyze_overlap(Z_H, Z_Ca, Z_Fe):
-    results = []
-    shape = Z_H.shape
-    for i in range(shape[0]):
-        for j in range(shape[1]):
-            h, ca, fe = Z_H[i, j], Z_Ca[i, j], Z_Fe[i, j]
-            pattern, meaning = classify_bfip_region(h, ca, fe)
-            results.append({
-                'i': i, 'j': j,
-                'H+': h, 'Ca2+': ca, 'Fe2+': fe,
-                'Pattern': format(pattern, '03b'),
-                'Interpretation': meaning
-            })
-    return results
+    return pattern, INTERPRETATIONS.get(pattern, "Unknown pattern")
+
+def describe_pattern(code, ions=DEFAULT_IONS):
+    """
+    Interpretation of one overlap pattern; the first ion is the most
+    significant bit. H+/Ca2+/Fe2+ use INTERPRETATIONS, other ion sets follow the
+    wording of the data/Logic_Map_*.csv tables.
+    """
+    if tuple(ions) == DEFAULT_IONS:
+        return INTERPRETATIONS.get(int(code), "Unknown pattern")
+    active = [ion for k, ion in enumerate(ions) if (int(code) >> (len(ions) - 1 - k)) & 1]
+    if not active:
+        return "No BFIP activity"
+    if len(active) == 1:
+        return f"{active[0]}-only activation"
+    if len(active) == len(ions):
+        return f"Full cooperative BFIP ({', '.join(active)})"
+    return f"{' + '.join(active)} synergy"
+
+def overlap_patterns(masks):
+    """
+    Bit-pack N same-shape ion masks into one integer pattern raster,
+    mask k contributing bit N-1-k (so H+, Ca2+, Fe2+ gives h<<2 | ca<<1 | fe).
+    The dtype is the smallest unsigned type holding N bits.
+    """
+    masks = list(masks)
+    if not 0 < len(masks) <= 64:
+        raise ValueError(f"Need 1 to 64 ion masks, got {len(masks)}")
+    dtype = next(t for t in (np.uint8, np.uint16, np.uint32, np.uint64)
+                 if np.iinfo(t).bits >= len(masks))
+    shapes = {np.shape(mask) for mask in masks}
+    if len(shapes) > 1:
+        raise ValueError(f"Masks have different shapes: {sorted(shapes)}")
+    pattern = np.zeros(np.shape(masks[0]), dtype=dtype)
+    for mask in masks:
+        pattern <<= dtype(1)
+        pattern |= np.asarray(mask).astype(bool)
+    return pattern
+
+def pattern_table(pattern, ions, cell_area=1.0, include_empty=False):
+    """
+    Per-pattern summary of a pattern raster as a DataFrame: 'Pattern' (bit
+    string), one 0/1 column per ion, 'Count', 'Area' (count × cell_area),
+    'Fraction' and 'Interpretation'. Counts come from one np.bincount (or
+    np.unique for more than 16 ions), and interpretations are looked up once
+    per distinct pattern. Patterns that never occur are dropped unless
+    include_empty is set (≤ 16 ions).
+    """
+    n = len(ions)
+    flat = pattern.ravel()
+    if n <= 16:
+        counts = np.bincount(flat, minlength=1 << n)
+        codes = np.arange(1 << n) if include_empty else np.flatnonzero(counts)
+        counts = counts[codes]
+    else:
+        codes, counts = np.unique(flat, return_counts=True)
+
+    table = pd.DataFrame({'Pattern': [format(int(c), f'0{n}b') for c in codes]})
+    for k, ion in enumerate(ions):
+        table[ion] = ((codes.astype(np.uint64) >> np.uint64(n - 1 - k)) & np.uint64(1)).astype(np.uint8)
+    table['Count'] = counts
+    table['Area'] = counts * cell_area
+    table['Fraction'] = counts / max(flat.size, 1)
+    table['Interpretation'] = [describe_pattern(c, ions) for c in codes]
+    return table
+
+def overlap_records(pattern, ions):
+    """
+    Per-cell structured array (cell index, one uint8 field per ion, pattern
+    code) — the cell list analyze_overlap used to build as dicts, at a few
+    bytes per cell. The index fields are 'i', 'j', 'k', ... for rasters of
+    up to 3 dimensions ('i', 'j' for the usual 2-D maps) and 'axis0', ...
+    beyond that. Interpretations live in pattern_table.
+    """
+    n = len(ions)
+    index_names = list('ijk'[:pattern.ndim]) if pattern.ndim <= 3 else [f'axis{d}' for d in range(pattern.ndim)]
+    records = np.empty(pattern.size, dtype=[(name, np.int32) for name in index_names]
+                       + [(ion, np.uint8) for ion in ions] + [('Pattern', pattern.dtype)])
+    for name, idx in zip(index_names, np.indices(pattern.shape).reshape(pattern.ndim, pattern.size)):
+        records[name] = idx
+    flat = pattern.ravel()
+    word = pattern.dtype.type
+    for k, ion in enumerate(ions):
+        records[ion] = (flat >> word(n - 1 - k)) & word(1)
+    records['Pattern'] = flat
+    return records
+
+def logic_map_table(masks, ions):
+    """
+    Logic map ('Logic Code', 'Count', 'Interpretation', as in
+    data/Logic_Map__Fe____Ca____NewIon.csv) of bit-packed masks, counted
+    from the packed words without unpacking. Codes that never occur are
+    left out.
+    """
+    counts = pattern_counts(masks)
+    codes = np.flatnonzero(counts)
+    return pd.DataFrame({
+        'Logic Code': [format(int(c), f'0{len(ions)}b') for c in codes],
+        'Count': counts[codes],
+        'Interpretation': [describe_pattern(c, ions) for c in codes],
+    })
+
+def analyze_overlap(*masks, ions=None, cell_area=1.0):
+    """
+    Overlap logic of any number of ion masks (default names H+, Ca2+, Fe2+
+    for three masks, ion0.. otherwise).
+
+    Returns (pattern, table): the bit-packed pattern raster from
+    overlap_patterns and the per-pattern pattern_table.
+    """
+    if ions is None:
+        ions = DEFAULT_IONS if len(masks) == 3 else tuple(f"ion{k}" for k in range(len(masks)))
+    if len(ions) != len(masks):
+        raise ValueError(f"{len(masks)} masks but {len(ions)} ion names")
+    pattern = overlap_patterns(masks)
+    return pattern, pattern_table(pattern, ions, cell_area)
 
 
 def main():
@@ -1,46 +1,19 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from thermo_dynamic_model import run_dynamic_thermo
-from models.thermodynamics import gibbs_free_energy
+from bfip_network import simulate_network, gate_metrics
 
-R = 8.314
-THR_THETA = 0.10
-THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(base, pert):
-    hist2d, _, _ = np.histogram2d(base, pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
-def simulate_gate_chain(n_gates=3, amp_base=0.50, amp_high=0.80, T0=300.0):
+def simulate_gate_chain(n_gates=3, amp_base=0.50, amp_high=0.80, T0=300.0, coupling=None):
     t_span = np.linspace(0, 120, 300)
     dH = -46.84
     dS = -0.102
 
-    theta_history = []
-    bfip_states = []
-
-    for gate in range(n_gates):
-        amp = amp_base + gate * (amp_high - amp_base) / max(n_gates - 1, 1)
-        kin_base = {'k_on': 1e5, 'amplitude': amp}
-        _, theta_base = run_dynamic_thermo(kin_base, None, T0, t_span, dH, dS, 1.0)
-
-        kin_pert = {'k_on': 1e5, 'amplitude': amp * (1 - MI_PERTURB)}
-        _, theta_pert = run_dynamic_thermo(kin_pert, None, T0, t_span, dH, dS, 1.0)
-
-        theta_mean = np.mean(theta_base)
-        mi = compute_mi(theta_base, theta_pert)
-        dG = gibbs_free_energy(theta_mean, dH, dS, T0)
-        is_bfip = int((theta_mean > THR_THETA) and (mi > THR_MI) and (dG < -(R * T0 / 1000) * np.log(2)))
-
-        theta_history.append(theta_base)
-        bfip_states.append(is_bfip)
+    amps = amp_base + np.arange(n_gates) * (amp_high - amp_base) / max(n_gates - 1, 1)
+    theta_history, theta_pert = simulate_network(t_span, amps, dH, dS, T0,
+                                                 coupling=coupling, perturb=MI_PERTURB)
+    _, _, _, bfip_states = gate_metrics(theta_history, theta_pert, dH, dS, T0)
 
     return t_span, theta_history, bfip_states
 
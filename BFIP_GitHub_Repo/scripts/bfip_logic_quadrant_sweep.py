@@ -1,24 +1,21 @@
 
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
-from thermo_dynamic_model import run_dynamic_thermo
+from thermo_dynamic_model import run_dynamic_thermo_cached as run_dynamic_thermo
+from models.cache import configure_cache, format_stats
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
+from models.classifier import METRICS, classify
+from models.result_store import write_results
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
-def check_bfip(dH, dS, amp=0.30, T0=300.0):
+def quadrant_metrics(dH, dS, amp=0.30, T0=300.0):
+    """Raw (θ̄, MI, ΔG) of one gate; check_bfip applies the thresholds"""
     t_span = np.linspace(0, 120.0, 300)
     kin_base = {'k_on': 1e5, 'amplitude': amp}
     n = 1.0
@@ -30,10 +27,14 @@ def check_bfip(dH, dS, amp=0.30, T0=300.0):
     theta_mean = np.mean(theta_base)
     mi = compute_mi(theta_base, theta_pert)
     dG = gibbs_free_energy(theta_mean, dH, dS, T0)
+    return theta_mean, mi, dG
 
-    return (theta_mean > THR_THETA) and (mi > THR_MI) and (dG < -(R_gas * T0 / 1000) * np.log(2))
+def check_bfip(dH, dS, amp=0.30, T0=300.0):
+    """(BFIP flag, (θ̄, MI, ΔG)) of one gate"""
+    metrics = quadrant_metrics(dH, dS, amp, T0)
+    return bool(classify(dict(zip(METRICS, metrics)), THR_THETA, THR_MI, T=T0)), metrics
 
-def evaluate_quadrants():
+def evaluate_quadrants(store_path=None, T0=300.0):
     # Define candidate ΔH/ΔS coordinates from earlier scans
     logic_points = {
         '00 (OFF, OFF)':  ((-20.0, -0.05), (-20.0, -0.05)),
@@ -43,12 +44,24 @@ def evaluate_quadrants():
     }
 
     results = []
+    rows = []
     for label, (h_coords, ca_coords) in logic_points.items():
-        H_on = check_bfip(*h_coords)
-        Ca_on = check_bfip(*ca_coords)
+        gates = []
+        for ion, coords in (('H+', h_coords), ('Ca2+', ca_coords)):
+            on, metrics = check_bfip(*coords, T0=T0)
+            gates.append(on)
+            rows.append((label, ion) + coords + metrics)
+        H_on, Ca_on = gates
         pattern = f"{int(H_on)}{int(Ca_on)}"
         results.append((label, pattern, h_coords, ca_coords))
 
+    if store_path is not None:
+        # Keep the raw metrics so other thresholds can be tried with models.classifier
+        columns = dict(zip(('target', 'ion', 'dH', 'dS') + METRICS, map(np.array, zip(*rows))))
+        write_results(store_path, columns,
+                      metadata={'source': 'bfip_logic_quadrant_sweep.py', 'T0': T0, 'MI_perturb': MI_PERTURB,
+                                'thresholds': {'theta': THR_THETA, 'MI': THR_MI}})
+
     return results
 
 def print_results(results):
@@ -58,5 +71,15 @@ def print_results(results):
         print(f"  ➤ Result: {pattern} | H⁺: {h_coords} | Ca²⁺: {ca_coords}\n")
 
 if __name__ == '__main__':
-    results = evaluate_quadrants()
+    parser = argparse.ArgumentParser(description="Evaluate the four BFIP logic quadrants")
+    parser.add_argument('--cache', nargs='?', const='', default=None, metavar='DIR',
+                        help='Reuse run_dynamic_thermo results: in memory, or also on disk under DIR')
+    parser.add_argument('--store', default=None, help='Also write the per-gate θ̄ / MI / ΔG to this result-store directory')
+    args = parser.parse_args()
+    if args.cache is not None:
+        configure_cache(args.cache or None)
+
+    results = evaluate_quadrants(store_path=args.store)
     print_results(results)
+    if args.cache is not None:
+        print(format_stats())
@@ -1,23 +1,15 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from thermo_dynamic_model import run_dynamic_thermo
+from thermo_dynamic_model import init_thermo_state, step_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(base, pert):
-    hist2d, _, _ = np.histogram2d(base, pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def sinusoidal_amp(t, base=0.20, amp=0.45, freq=1/60):
     return base + amp * np.sin(2 * np.pi * freq * t)
 
@@ -29,14 +21,16 @@ def simulate_oscillator(T0=300.0):
     amplitudes = []
     bfip_states = []
 
+    dt = t_span[1] - t_span[0]
+    state_base = init_thermo_state({'k_on': 1e5}, T0, dH, dS, 1.0, t0=t_span[0])
+    state_pert = init_thermo_state({'k_on': 1e5}, T0, dH, dS, 1.0, t0=t_span[0])
+
     for t in t_span:
         amp = sinusoidal_amp(t)
         amplitudes.append(amp)
 
-        kin_base = {'k_on': 1e5, 'amplitude': amp}
-        _, theta_base = run_dynamic_thermo(kin_base, None, T0, [t, t + 1], dH, dS, 1.0)
-        kin_pert = {'k_on': 1e5, 'amplitude': amp * (1 - MI_PERTURB)}
-        _, theta_pert = run_dynamic_thermo(kin_pert, None, T0, [t, t + 1], dH, dS, 1.0)
+        theta_base = step_thermo(state_base, dt, amp)
+        theta_pert = step_thermo(state_pert, dt, amp * (1 - MI_PERTURB))
 
         theta_mean = np.mean(theta_base)
         mi = compute_mi(theta_base, theta_pert)
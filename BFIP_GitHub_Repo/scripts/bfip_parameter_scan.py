@@ -1,23 +1,17 @@
 
+import argparse
 import numpy as np
 import csv
 from thermo_dynamic_model import run_dynamic_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
+from models.surrogate import active_scan, format_cv, latin_design
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def test_bfip(dH, dS, amp, kon, nH, T0=300.0):
     t_span = np.linspace(0, 120.0, 300)
     kin_base = {'k_on': kon, 'amplitude': amp}
@@ -59,5 +53,43 @@ def scan_parameters():
 
     print("✅ Parameter scan complete. Results saved to BFIP_param_scan_Ca.csv")
 
+# 5-D box scanned in surrogate mode: ΔH, ΔS, amplitude, k_on (log-scaled), n_H
+SURROGATE_BOUNDS = [(-60.0, -30.0), (-0.20, 0.00), (0.50, 1.00), (1e4, 1e6), (1.0, 2.0)]
+SURROGATE_LOG_AXES = (3,)
+
+def simulate_metrics(X):
+    """True (θ̄, MI, ΔG) for rows (ΔH, ΔS, amplitude, k_on, n_H)"""
+    return np.array([test_bfip(*row)[1:] for row in X])
+
+def scan_parameters_surrogate(n_candidates=20000, max_true=400, seed=0):
+    """
+    Classify n_candidates Latin-hypercube points of SURROGATE_BOUNDS with a
+    GP emulator, running the true model only where the BFIP bit is uncertain.
+    """
+    candidates = latin_design(SURROGATE_BOUNDS, n_candidates, SURROGATE_LOG_AXES, seed=seed + 1)
+    scan = active_scan(simulate_metrics, candidates, SURROGATE_BOUNDS, SURROGATE_LOG_AXES,
+                       max_true=max_true, seed=seed, verbose=True,
+                       thresholds={'thr_theta': THR_THETA, 'thr_mi': THR_MI, 'T': 300.0})
+
+    with open("BFIP_param_scan_surrogate.csv", "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ΔH', 'ΔS', 'Amplitude', 'k_on', 'n_H', 'BFIP', 'θ̄', 'MI', 'ΔG', 'P_BFIP', 'Simulated'])
+        writer.writerows([*x, int(b), *m, p, int(t)] for x, b, m, p, t in
+                         zip(candidates, scan['bfip'], scan['mean'], scan['p_bfip'], scan['is_true']))
+
+    print(format_cv(scan['cv']))
+    print(f"✅ Surrogate scan: {n_candidates} points from {scan['n_true']} true simulations. "
+          f"Results saved to BFIP_param_scan_surrogate.csv")
+
 if __name__ == '__main__':
-    scan_parameters()
+    parser = argparse.ArgumentParser(description='BFIP scan over amplitude, k_on and n_H')
+    parser.add_argument('--surrogate', action='store_true',
+                        help='Scan the 5-D ΔH/ΔS/amplitude/k_on/n_H box with a GP emulator')
+    parser.add_argument('--n-candidates', type=int, default=20000, help='Points classified in surrogate mode')
+    parser.add_argument('--max-true', type=int, default=400, help='True-simulation budget in surrogate mode')
+    parser.add_argument('--seed', type=int, default=0, help='Design seed in surrogate mode')
+    args = parser.parse_args()
+    if args.surrogate:
+        scan_parameters_surrogate(args.n_candidates, args.max_true, args.seed)
+    else:
+        scan_parameters()
@@ -1,24 +1,21 @@
 
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
+from sweep_executor import sweep_grid, sweep_points
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
+from models.classifier import METRICS, classify
+from models.result_store import write_results, grid_columns
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
-def test_bfip(dH, dS, amp=0.85, T0=300.0):
+def bfip_metrics(dH, dS, amp=0.85, T0=300.0):
+    """Raw (θ̄, MI, ΔG) of one cell; thresholds are applied by models.classifier"""
     t_span = np.linspace(0, 120.0, 300)
     kin_base = {'k_on': 1e5, 'amplitude': amp}
     _, theta_base = run_dynamic_thermo(kin_base, None, T0, t_span[:2], dH, dS, 1.0)
@@ -29,21 +26,105 @@ def test_bfip(dH, dS, amp=0.85, T0=300.0):
     theta_mean = np.mean(theta_base)
     mi = compute_mi(theta_base, theta_pert)
     dG = gibbs_free_energy(theta_mean, dH, dS, T0)
+    return theta_mean, mi, dG
 
-    is_bfip = (theta_mean > THR_THETA) and (mi > THR_MI) and (dG < -(R_gas * T0 / 1000) * np.log(2))
-    return int(is_bfip)
+def test_bfip(dH, dS, amp=0.85, T0=300.0):
+    theta_mean, mi, dG = bfip_metrics(dH, dS, amp, T0)
+    fields = {'theta_mean': theta_mean, 'MI': mi, 'dG': dG}
+    return int(classify(fields, THR_THETA, THR_MI, T=T0))
 
-def map_phase_space(dH_center=-46.0, dS_center=-0.11, span=5.0, step=0.5, amp=0.85):
+def map_phase_space(dH_center=-46.0, dS_center=-0.11, span=5.0, step=0.5, amp=0.85, workers=1, T0=300.0, store_path=None):
     dH_vals = np.arange(dH_center - span, dH_center + span + step, step)
     dS_vals = np.arange(dS_center - span, dS_center + span + step, step)
-    Z = np.zeros((len(dH_vals), len(dS_vals)), dtype=int)
+    cells = sweep_grid(bfip_metrics, dH_vals, dS_vals, workers=workers, amp=amp, T0=T0)
+    fields = dict(zip(METRICS, np.moveaxis(cells, -1, 0)))
+    Z = classify(fields, THR_THETA, THR_MI, T=T0).astype(int)
+    if store_path is not None:
+        # θ̄ / MI / ΔG fields; re-threshold with models.classifier.lazy_classifier(store_path)
+        axes = {'dH': dH_vals, 'dS': dS_vals}
+        write_results(store_path, grid_columns(axes, bfip=Z, **fields), axes=axes,
+                      metadata={'source': 'bfip_phase_edge_mapper.py', 'amp': amp, 'T0': T0, 'MI_perturb': MI_PERTURB,
+                                'thresholds': {'theta': THR_THETA, 'MI': THR_MI}})
+
+    return dH_vals, dS_vals, Z
+
+def map_phase_adaptive(dH_center=-46.0, dS_center=-0.11, span=5.0, coarse=21, max_depth=6,
+                       amp=0.85, workers=1, predicate=test_bfip):
+    """
+    Quadtree refinement of the ΔH–ΔS BFIP edge.
 
-    for i, dH in enumerate(dH_vals):
-        for j, dS in enumerate(dS_vals):
-            Z[i, j] = test_bfip(dH, dS, amp)
+    Starts from a coarse×coarse lattice and splits only cells whose four
+    corners disagree on the predicate, down to max_depth halvings. All samples
+    sit on the finest lattice of (coarse-1)·2^max_depth + 1 nodes per axis, so
+    defaults (21, 6) give an effective 1281×1281 map. Cells with agreeing
+    corners are assumed uniform, so islands smaller than a coarse cell that
+    touch none of its corners can be missed.
 
+    Returns a dict with the finest-lattice axes 'dH_vals'/'dS_vals', the
+    sparse sample set 'index' (lattice i, j), 'points' (ΔH, ΔS) and 'bfip',
+    and 'leaves' as (i, j, size, value) rows (value -1 for mixed cells at
+    max depth). Use rasterize_adaptive / boundary_polyline on it.
+    """
+    scale = 2 ** max_depth
+    n_nodes = (coarse - 1) * scale + 1
+    dH_vals = np.linspace(dH_center - span, dH_center + span, n_nodes)
+    dS_vals = np.linspace(dS_center - span, dS_center + span, n_nodes)
+    samples = {}
+
+    def evaluate(keys):
+        new = sorted(set(k for k in keys if k not in samples))
+        values = sweep_points(predicate, [(dH_vals[i], dS_vals[j]) for i, j in new],
+                              workers=workers, amp=amp)
+        samples.update(zip(new, (int(v) for v in values)))
+
+    cells = [(i * scale, j * scale) for i in range(coarse - 1) for j in range(coarse - 1)]
+    size = scale
+    evaluate((i * scale, j * scale) for i in range(coarse) for j in range(coarse))
+    leaves = []
+    while cells:
+        mixed = []
+        for i, j in cells:
+            corners = {samples[(i, j)], samples[(i + size, j)],
+                       samples[(i, j + size)], samples[(i + size, j + size)]}
+            if len(corners) == 1:
+                leaves.append((i, j, size, corners.pop()))
+            elif size == 1:
+                leaves.append((i, j, size, -1))
+            else:
+                mixed.append((i, j))
+
+        size //= 2
+        cells = [(i + di, j + dj) for i, j in mixed for di in (0, size) for dj in (0, size)]
+        evaluate(k for i, j in mixed
+                 for k in ((i + size, j), (i, j + size), (i + size, j + size),
+                           (i + 2 * size, j + size), (i + size, j + 2 * size)))
+
+    index = np.array(sorted(samples), dtype=int).reshape(-1, 2)
+    return {
+        'dH_vals': dH_vals,
+        'dS_vals': dS_vals,
+        'index': index,
+        'points': np.column_stack([dH_vals[index[:, 0]], dS_vals[index[:, 1]]]),
+        'bfip': np.array([samples[tuple(k)] for k in index], dtype=int),
+        'leaves': np.array(leaves, dtype=int).reshape(-1, 4),
+    }
+
+def rasterize_adaptive(result):
+    """Fill the finest lattice from an adaptive result -> (dH_vals, dS_vals, Z)"""
+    dH_vals, dS_vals = result['dH_vals'], result['dS_vals']
+    Z = np.zeros((len(dH_vals), len(dS_vals)), dtype=int)
+    for i, j, size, value in result['leaves']:
+        if value >= 0:
+            Z[i:i + size + 1, j:j + size + 1] = value
+    Z[result['index'][:, 0], result['index'][:, 1]] = result['bfip']
     return dH_vals, dS_vals, Z
 
+def boundary_polyline(dH_vals, dS_vals, Z):
+    """ON/OFF edge of a heatmap as a list of (n, 2) arrays of (ΔH, ΔS) vertices"""
+    from contourpy import contour_generator
+    lines = contour_generator(x=dS_vals, y=dH_vals, z=Z.astype(float)).lines(0.5)
+    return [line[:, ::-1] for line in lines]
+
 def plot_heatmap(dH_vals, dS_vals, Z):
     plt.figure(figsize=(8, 6))
     plt.imshow(Z.T, origin='lower', aspect='auto',
@@ -58,5 +139,22 @@ def plot_heatmap(dH_vals, dS_vals, Z):
     plt.show()
 
 if __name__ == '__main__':
-    dH_vals, dS_vals, Z = map_phase_space()
+    parser = argparse.ArgumentParser(description='Refined BFIP phase edge mapping over ΔH–ΔS')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for the sweep (0 = all cores)')
+    parser.add_argument('--store', default=None, help='Also write the θ̄ / MI / ΔG fields to this result-store directory')
+    parser.add_argument('--adaptive', action='store_true', help='Quadtree-refine the ON/OFF boundary')
+    parser.add_argument('--max-depth', type=int, default=6, help='Refinement levels in adaptive mode')
+    args = parser.parse_args()
+    if args.adaptive and args.store:
+        # adaptive samples are 0/1 predicate values on a sparse set, not θ̄ / MI / ΔG grids
+        parser.error('--store is only supported for the full grid sweep, not with --adaptive')
+    if args.adaptive:
+        result = map_phase_adaptive(max_depth=args.max_depth, workers=args.workers)
+        dH_vals, dS_vals, Z = rasterize_adaptive(result)
+        edges = boundary_polyline(dH_vals, dS_vals, Z)
+        np.savez('BFIP_phase_edge_adaptive.npz', points=result['points'], bfip=result['bfip'],
+                 **{f'edge_{k}': line for k, line in enumerate(edges)})
+        print(f"Adaptive map: {len(result['bfip'])} samples, {len(edges)} boundary segment(s)")
+    else:
+        dH_vals, dS_vals, Z = map_phase_space(workers=args.workers, store_path=args.store)
     plot_heatmap(dH_vals, dS_vals, Z)
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R = 8.314
 THR_THETA = 0.10
@@ -55,15 +56,6 @@ def simulate_phase_lock():
 
     return t_span, np.array(amps), np.array(thetas), np.array(mis), np.array(dGs), np.array(bfips)
 
-def compute_mi(base, pert):
-    hist2d, _, _ = np.histogram2d(base, pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def plot_phase_lock(t, amps, thetas, mis, dGs, bfips):
     plt.figure(figsize=(12, 10))
 
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator
 
 # Time base
 t = np.linspace(0, 10, 1000)
@@ -16,25 +17,22 @@ def base_gate(input_signal, freq, phase_shift):
 
 # Cascade Logic Layer
 def cascade_gate(previous_theta, freq=1.5, phase_shift=0.0, memory_window=50):
-    gate = np.zeros_like(previous_theta)
-    for i in range(memory_window, len(previous_theta)):
-        mem_avg = np.mean(previous_theta[i - memory_window:i])
-        signal = (np.sin(2 * np.pi * freq * t[i] + phase_shift) + 1) / 2
-        gate[i] = signal * mem_avg
+    mem_avg = rolling_mean(previous_theta, memory_window, fill=0.0)
+    gate = oscillator(t, freq, phase_shift) * mem_avg
     return gaussian_filter1d(gate, sigma=2)
 
 # First gate: base ion gating
 G1 = base_gate(I_t, freq=1.5, phase_shift=0)
 θ1 = np.cumsum(G1) / len(G1)
 ΔG1 = -np.gradient(θ1)
-MI1 = np.correlate(I_t - np.mean(I_t), G1 - np.mean(G1), mode='same') / len(I_t)
+MI1 = mutual_info_proxy(I_t, G1)
 BFIP1 = (θ1 > 0.15) & (MI1 > 0.005)
 
 # Second gate: cascaded information from θ1
 G2 = cascade_gate(θ1, freq=1.6, phase_shift=np.pi/4)
 θ2 = np.cumsum(G2) / len(G2)
 ΔG2 = -np.gradient(θ2)
-MI2 = np.correlate(G1 - np.mean(G1), G2 - np.mean(G2), mode='same') / len(G1)
+MI2 = mutual_info_proxy(G1, G2)
 BFIP2 = (θ2 > 0.15) & (MI2 > 0.005)
 
 # Plot
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 
@@ -15,15 +16,10 @@ G1 = (np.sin(2 * np.pi * 1.5 * t) + 1) / 2 * I_t
 
 # Gate 2: Cascaded from θ̄₁
 def relay_encode_gate(θ_input, t, base_freq=1.6, threshold=0.1):
-    gate = np.zeros_like(t)
-    freq_mod = base_freq
-    for i in range(100, len(t)):
-        avg_theta = np.mean(θ_input[i-100:i])
-        # Modulate based on θ̄₁ signal strength
-        if avg_theta > threshold:
-            freq_mod = base_freq + (avg_theta - threshold) * 5  # encode higher frequency
-            signal = (np.sin(2 * np.pi * freq_mod * t[i]) + 1) / 2
-            gate[i] = signal * avg_theta
+    avg_theta = rolling_mean(θ_input, 100)
+    # Modulate based on θ̄₁ signal strength
+    freq_mod = base_freq + (avg_theta - threshold) * 5  # encode higher frequency
+    gate = threshold_gate(avg_theta, threshold, oscillator(t, freq_mod))
     return gaussian_filter1d(gate, sigma=2)
 
 G2 = relay_encode_gate(θ1, t)
@@ -35,7 +31,7 @@ G3 = gaussian_filter1d(G2, sigma=4) * ((np.sin(2 * np.pi * 1.3 * t) + 1) / 2)
 
 # ΔG and MI
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate(G2 - np.mean(G2), G3 - np.mean(G3), mode='same') / len(G2)
+MI3 = mutual_info_proxy(G2, G3)
 BFIP3 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Plot
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 
@@ -15,16 +16,9 @@ G1 = (np.sin(2 * np.pi * 1.5 * t) + 1) / 2 * I_t
 
 # Gate 2: Encodes function from θ̄₁ pattern
 def encoder_gate(θ_input, t, window=100, encode_threshold=0.18):
-    pattern_memory = []
-    gate = np.zeros_like(t)
-    for i in range(window, len(t)):
-        pattern = θ_input[i - window:i]
-        avg = np.mean(pattern)
-        pattern_memory.append(avg)
-
-        # Fire if a rising encoded structure is recognized
-        if avg > encode_threshold:
-            gate[i] = (np.sin(2 * np.pi * 1.2 * t[i]) + 1) / 2 * avg
+    avg = rolling_mean(θ_input, window)
+    # Fire if a rising encoded structure is recognized
+    gate = threshold_gate(avg, encode_threshold, oscillator(t, 1.2))
     return gaussian_filter1d(gate, sigma=2)
 
 G2 = encoder_gate(θ1, t)
@@ -44,7 +38,7 @@ G3 = logic_filter_gate(G2, t)
 
 # ΔG and MI
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate(G2 - np.mean(G2), G3 - np.mean(G3), mode='same') / len(G2)
+MI3 = mutual_info_proxy(G2, G3)
 BFIP3 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Plot
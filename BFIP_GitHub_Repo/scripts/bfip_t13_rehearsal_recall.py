@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 
@@ -15,11 +16,8 @@ G1 = (np.sin(2 * np.pi * 1.5 * t) + 1) / 2 * I_t
 
 # Gate 2: Encoded with memory logic (Tier 12)
 def encoder_gate(θ_input, t, window=100, encode_threshold=0.18):
-    gate = np.zeros_like(t)
-    for i in range(window, len(t)):
-        avg = np.mean(θ_input[i - window:i])
-        if avg > encode_threshold:
-            gate[i] = (np.sin(2 * np.pi * 1.2 * t[i]) + 1) / 2 * avg
+    avg = rolling_mean(θ_input, window)
+    gate = threshold_gate(avg, encode_threshold, oscillator(t, 1.2))
     return gaussian_filter1d(gate, sigma=2)
 
 G2 = encoder_gate(θ1, t)
@@ -27,12 +25,8 @@ G2 = encoder_gate(θ1, t)
 
 # Tier 13: G2 enters a feedback rehearsal loop before triggering G3
 def rehearsal_gate(G_encoded, t, memory_feedback_gain=0.5, window=50):
-    rehearsal = np.zeros_like(t)
-    for i in range(window, len(t)):
-        avg_mem = np.mean(G_encoded[i - window:i])
-        if avg_mem > 0.01:
-            loop_signal = (np.sin(2 * np.pi * 1.1 * t[i]) + 1) / 2
-            rehearsal[i] = loop_signal * avg_mem * memory_feedback_gain
+    avg_mem = rolling_mean(G_encoded, window)
+    rehearsal = threshold_gate(avg_mem, 0.01, oscillator(t, 1.1), memory_feedback_gain)
     return gaussian_filter1d(rehearsal, sigma=3)
 
 G2_rehearsed = rehearsal_gate(G2, t)
@@ -51,7 +45,7 @@ G3 = final_gate(G2_rehearsed, t)
 
 # ΔG and MI
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate(G2_rehearsed - np.mean(G2_rehearsed), G3 - np.mean(G3), mode='same') / len(G2_rehearsed)
+MI3 = mutual_info_proxy(G2_rehearsed, G3)
 BFIP3 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Plot
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 
@@ -13,11 +14,8 @@ G1 = (np.sin(2 * np.pi * 1.5 * t) + 1) / 2 * I_t
 
 # Tier 12 logic preserved
 def encoder_gate(θ_input, t, window=100, encode_threshold=0.18):
-    gate = np.zeros_like(t)
-    for i in range(window, len(t)):
-        avg = np.mean(θ_input[i - window:i])
-        if avg > encode_threshold:
-            gate[i] = (np.sin(2 * np.pi * 1.2 * t[i]) + 1) / 2 * avg
+    avg = rolling_mean(θ_input, window)
+    gate = threshold_gate(avg, encode_threshold, oscillator(t, 1.2))
     return gaussian_filter1d(gate, sigma=2)
 
 G2 = encoder_gate(θ1, t)
@@ -25,12 +23,8 @@ G2 = encoder_gate(θ1, t)
 
 # Echo loop to reinforce weak θ̄₂ memory
 def echo_loop(G_input, t, echo_gain=0.8, echo_window=50, echo_trigger=0.01):
-    echo = np.zeros_like(t)
-    for i in range(echo_window, len(t)):
-        recent = G_input[i - echo_window:i]
-        if np.mean(recent) > echo_trigger:
-            phase = np.sin(2 * np.pi * 1.0 * t[i])
-            echo[i] = echo_gain * np.mean(recent) * ((phase + 1) / 2)
+    recent = rolling_mean(G_input, echo_window)
+    echo = threshold_gate(recent, echo_trigger, oscillator(t, 1.0), echo_gain)
     return gaussian_filter1d(echo, sigma=3)
 
 G_echo = echo_loop(G2, t)
@@ -42,7 +36,7 @@ G3 = gaussian_filter1d(G2 + G_echo, sigma=2)
 
 # ΔG and MI
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate((G2 + G_echo) - np.mean(G2 + G_echo), G3 - np.mean(G3), mode='same') / len(G3)
+MI3 = mutual_info_proxy(G2 + G_echo, G3)
 BFIP3 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Plot
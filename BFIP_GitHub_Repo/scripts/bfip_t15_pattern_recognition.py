@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 pulse_freq = 1.5
@@ -18,14 +19,9 @@ G1 = (np.sin(2 * np.pi * pulse_freq * t) + 1) / 2 * I_t
 
 # Gate 2: Pattern detector + memory storage
 def pattern_memory_gate(θ_input, t, threshold=0.2, window=80):
-    memory = []
-    out = np.zeros_like(t)
-    for i in range(window, len(t)):
-        avg = np.mean(θ_input[i - window:i])
-        if avg > threshold:
-            pattern = np.sin(2 * np.pi * 1.1 * t[i])
-            out[i] = (pattern + 1) / 2 * avg
-            memory.append(avg)
+    avg = rolling_mean(θ_input, window)
+    out = threshold_gate(avg, threshold, oscillator(t, 1.1))
+    memory = list(avg[avg > threshold])
     return gaussian_filter1d(out, sigma=2), memory
 
 G2, mem_store = pattern_memory_gate(θ1, t)
@@ -45,7 +41,7 @@ G3 = reentrant_gate(G2, mem_store, t)
 
 # BFIP₄ Activation Metrics
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate(G2 - np.mean(G2), G3 - np.mean(G3), mode='same') / len(G2)
+MI3 = mutual_info_proxy(G2, G3)
 BFIP4 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Plot
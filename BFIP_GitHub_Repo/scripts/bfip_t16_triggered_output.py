@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 pulse_freq = 1.5
@@ -18,12 +19,8 @@ G1 = (np.sin(2 * np.pi * pulse_freq * t) + 1) / 2 * I_t
 
 # Gate 2: Encoded pattern detection
 def encode_gate(θ_input, t, threshold=0.2, window=100):
-    output = np.zeros_like(t)
-    for i in range(window, len(t)):
-        mem_avg = np.mean(θ_input[i - window:i])
-        if mem_avg > threshold:
-            signal = (np.sin(2 * np.pi * 1.2 * t[i]) + 1) / 2
-            output[i] = signal * mem_avg
+    mem_avg = rolling_mean(θ_input, window)
+    output = threshold_gate(mem_avg, threshold, oscillator(t, 1.2))
     return gaussian_filter1d(output, sigma=2)
 
 G2 = encode_gate(θ1, t)
@@ -38,7 +35,7 @@ G3 = reentrant_recognition_gate(G2)
 
 # BFIP₄ Determination
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate(G2 - np.mean(G2), G3 - np.mean(G3), mode='same') / len(G2)
+MI3 = mutual_info_proxy(G2, G3)
 BFIP4 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Gate 4: Functional output triggered only when BFIP₄ holds
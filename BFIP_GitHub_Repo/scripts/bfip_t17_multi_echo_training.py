@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator, threshold_gate
 
 t = np.linspace(0, 10, 1000)
 pulse_freq = 1.5
@@ -18,11 +19,8 @@ G1 = (np.sin(2 * np.pi * pulse_freq * t) + 1) / 2 * I_t
 
 # Gate 2: Encode and store pattern
 def encode_gate(θ_input, t, threshold=0.2, window=100):
-    encoded = np.zeros_like(t)
-    for i in range(window, len(t)):
-        avg = np.mean(θ_input[i - window:i])
-        if avg > threshold:
-            encoded[i] = (np.sin(2 * np.pi * 1.2 * t[i]) + 1) / 2 * avg
+    avg = rolling_mean(θ_input, window)
+    encoded = threshold_gate(avg, threshold, oscillator(t, 1.2))
     return gaussian_filter1d(encoded, sigma=2)
 
 G2 = encode_gate(θ1, t)
@@ -30,11 +28,8 @@ G2 = encode_gate(θ1, t)
 
 # Gate 3: Echo training from both θ̄₁ and θ̄₂
 def echo_train_gate(t, θ1, θ2, training_gain=0.4, window=80):
-    echo = np.zeros_like(t)
-    for i in range(window, len(t)):
-        echo_avg = (np.mean(θ1[i - window:i]) + np.mean(θ2[i - window:i])) / 2
-        if echo_avg > 0.01:
-            echo[i] = (np.sin(2 * np.pi * 1.1 * t[i]) + 1) / 2 * echo_avg * training_gain
+    echo_avg = (rolling_mean(θ1, window) + rolling_mean(θ2, window)) / 2
+    echo = threshold_gate(echo_avg, 0.01, oscillator(t, 1.1), training_gain)
     return gaussian_filter1d(echo, sigma=2)
 
 G3 = echo_train_gate(t, θ1, θ2)
@@ -42,7 +37,7 @@ G3 = echo_train_gate(t, θ1, θ2)
 
 # Gate 4: Output fires if BFIP₄ thresholds are achieved after training
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate(G2 - np.mean(G2), G3 - np.mean(G3), mode='same') / len(G3)
+MI3 = mutual_info_proxy(G2, G3)
 BFIP4 = (θ3 > 0.15) & (MI3 > 0.005)
 
 G4 = np.zeros_like(t)
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy
 
 t = np.linspace(0, 10, 1000)
 pulse_freq = 1.5
@@ -31,7 +32,7 @@ G3 = gaussian_filter1d((G2a + G2b) / 2, sigma=2)
 
 # ΔG and MI
 ΔG3 = -np.gradient(θ3)
-MI3 = np.correlate((G2a + G2b)/2 - np.mean((G2a + G2b)/2), G3 - np.mean(G3), mode='same') / len(G3)
+MI3 = mutual_info_proxy((G2a + G2b)/2, G3)
 BFIP4 = (θ3 > 0.15) & (MI3 > 0.005)
 
 # Gate 4: Functional response from scaffolded memory state
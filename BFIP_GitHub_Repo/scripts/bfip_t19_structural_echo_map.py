@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy
 
 t = np.linspace(0, 10, 1000)
 pulse_freq = 1.5
@@ -34,7 +35,7 @@ G2 = gaussian_filter1d((θ1 + θ_echo) / 2, sigma=2)
 
 # ΔG and MI
 ΔG2 = -np.gradient(θ2)
-MI2 = np.correlate((Echo - np.mean(Echo)), (G2 - np.mean(G2)), mode='same') / len(Echo)
+MI2 = mutual_info_proxy(Echo, G2)
 BFIP5 = (θ2 > 0.15) & (MI2 > 0.005)
 
 # Output Trigger
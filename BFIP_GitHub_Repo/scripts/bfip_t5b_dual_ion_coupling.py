@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R = 8.314
 THR_THETA = 0.10
@@ -12,15 +13,6 @@ T0 = 300.0
 def coupling_amp(t, base=0.22, amp=0.40, freq=1/60):
     return base + amp * np.sin(2 * np.pi * freq * t)
 
-def compute_mi(base, pert):
-    hist2d, _, _ = np.histogram2d(base, pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def simulate_dual_ion_coupling():
     t_span = np.linspace(0, 240, 480)
     dH_H = -46.84
@@ -1,8 +1,9 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from thermo_dynamic_model import run_dynamic_thermo
+from thermo_dynamic_model import init_thermo_state, step_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R = 8.314
 THR_THETA = 0.10
@@ -16,15 +17,6 @@ def bootstrap_amp(t, mi_trace, base=0.20, amp=0.45, freq=1/60):
     mod = gain * 0.2  # Max +0.2 adjustment
     return base + amp * np.sin(2 * np.pi * freq * t) + mod
 
-def compute_mi(base, pert):
-    hist2d, _, _ = np.histogram2d(base, pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def simulate_mi_bootstrap():
     t_span = np.linspace(0, 240, 480)
     dH = -46.84
@@ -36,15 +28,16 @@ def simulate_mi_bootstrap():
     dGs = []
     bfips = []
 
+    dt = t_span[1] - t_span[0]
+    state_base = init_thermo_state({'k_on': 1e5}, T0, dH, dS, 1.0, t0=t_span[0])
+    state_pert = init_thermo_state({'k_on': 1e5}, T0, dH, dS, 1.0, t0=t_span[0])
+
     for i, t in enumerate(t_span):
         amp = bootstrap_amp(t, mis) if i >= 5 else 0.20 + 0.45 * np.sin(2 * np.pi * (1/60) * t)
         amps.append(amp)
 
-        kin_base = {'k_on': 1e5, 'amplitude': amp}
-        _, theta_base = run_dynamic_thermo(kin_base, None, T0, [t, t + 1], dH, dS, 1.0)
-
-        kin_pert = {'k_on': 1e5, 'amplitude': amp * 0.9}
-        _, theta_pert = run_dynamic_thermo(kin_pert, None, T0, [t, t + 1], dH, dS, 1.0)
+        theta_base = step_thermo(state_base, dt, amp)
+        theta_pert = step_thermo(state_pert, dt, amp * 0.9)
 
         theta_mean = np.mean(theta_base)
         mi = compute_mi(theta_base, theta_pert)
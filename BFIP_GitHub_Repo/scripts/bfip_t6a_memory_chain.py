@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R = 8.314
 THR_THETA = 0.10
@@ -13,15 +14,6 @@ def chain_input(t, pulse_width=40, repeat=80):
     """Returns pulsed input at defined intervals"""
     return 0.65 if int(t) % repeat < pulse_width else 0.20
 
-def compute_mi(base, pert):
-    hist2d, _, _ = np.histogram2d(base, pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def simulate_bfip_chain():
     t_span = np.linspace(0, 240, 480)
     dH = -46.84
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from thermo_dynamic_model import run_dynamic_thermo
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R = 8.314
 T0 = 300.0
@@ -12,15 +13,6 @@ THR_MI = 2.2
 def input_sequence(t, on=0.65, off=0.25, repeat=50, width=25):
     return on if int(t) % repeat < width else off
 
-def compute_mi(x, y):
-    hist2d, _, _ = np.histogram2d(x, y, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def simulate_weighted_binding():
     t_span = np.linspace(0, 240, 480)
     dH = -46.84
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import square
 import pandas as pd
+from models.signals import mutual_info_proxy
 
 t = np.linspace(0, 10, 1000)
 I_t = np.sin(2 * np.pi * 1.5 * t) ** 2
@@ -21,9 +22,6 @@ def theta_bar(input_signal):
 def delta_G(input_signal):
     return -np.gradient(input_signal)
 
-def mutual_info_proxy(I, O):
-    return np.correlate(I - np.mean(I), O - np.mean(O), mode='same') / len(I)
-
 theta_sine = theta_bar(G_sine)
 theta_square = theta_bar(G_square)
 theta_phase = theta_bar(G_phase)
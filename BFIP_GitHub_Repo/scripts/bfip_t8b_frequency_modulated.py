@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import square
 import pandas as pd
+from models.signals import mutual_info_proxy
 
 # Time base
 t = np.linspace(0, 10, 1000)
@@ -45,9 +46,6 @@ def theta_bar(input_signal):
 def delta_G(input_signal):
     return -np.gradient(input_signal)
 
-def mutual_info_proxy(I, O):
-    return np.correlate(I - np.mean(I), O - np.mean(O), mode='same') / len(I)
-
 theta_adaptive = theta_bar(G_adaptive)
 dG_adaptive = delta_G(theta_adaptive)
 MI_adaptive = mutual_info_proxy(I_t, O_adaptive)
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.signal import square
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_sum
 
 # Time base
 t = np.linspace(0, 10, 1000)
@@ -14,14 +15,11 @@ I_t = np.sin(2 * np.pi * 1.5 * t) ** 2
 # Memory-based predictor gate: looks back at pulse history to pre-activate
 def predictive_gate(t, input_signal, memory_window=50, prediction_horizon=25):
     gate = np.zeros_like(t)
-    pred_pattern = np.zeros(memory_window)
 
-    for i in range(memory_window, len(t) - prediction_horizon):
-        # Capture past window
-        past_window = input_signal[i - memory_window:i]
-        # Predict a future spike if past has strong structure
-        if np.sum(past_window) > memory_window * 0.25:  # threshold memory pattern
-            gate[i + prediction_horizon] = 1.0  # fire preemptively
+    # Predict a future spike if the past window has strong structure
+    past_sum = rolling_sum(input_signal, memory_window)[:len(t) - prediction_horizon]
+    fire = past_sum > memory_window * 0.25  # threshold memory pattern
+    gate[prediction_horizon:][fire] = 1.0  # fire preemptively
 
     # Smooth the gate
     from scipy.ndimage import gaussian_filter1d
@@ -40,9 +38,6 @@ def theta_bar(input_signal):
 def delta_G(input_signal):
     return -np.gradient(input_signal)
 
-def mutual_info_proxy(I, O):
-    return np.correlate(I - np.mean(I), O - np.mean(O), mode='same') / len(I)
-
 theta_predict = theta_bar(G_predict)
 dG_predict = delta_G(theta_predict)
 MI_predict = mutual_info_proxy(I_t, O_predict)
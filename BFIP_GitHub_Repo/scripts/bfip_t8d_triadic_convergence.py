@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 from scipy.signal import square
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy
 
 t = np.linspace(0, 10, 1000)
 dt = t[1] - t[0]
@@ -63,9 +64,6 @@ def theta_bar(input_signal):
 def delta_G(input_signal):
     return -np.gradient(input_signal)
 
-def mutual_info_proxy(I, O):
-    return np.correlate(I - np.mean(I), O - np.mean(O), mode='same') / len(I)
-
 theta = theta_bar(G_triadic)
 dG = delta_G(theta)
 MI_proxy = mutual_info_proxy(I_t, O_triadic)
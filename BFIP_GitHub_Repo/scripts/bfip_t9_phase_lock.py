@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.ndimage import gaussian_filter1d
 import pandas as pd
+from models.signals import mutual_info_proxy, rolling_mean, oscillator
 
 # Time vector
 t = np.linspace(0, 10, 1000)
@@ -13,33 +14,22 @@ I_t = np.sin(2 * np.pi * 1.5 * t) ** 2
 # Phase Lock System:
 # Simulates a gate that adjusts in real-time to stabilize coherence after BFIP activation
 def phase_lock_gate(t, input_signal, lock_threshold=0.005, memory_window=100):
-    gate = np.zeros_like(t)
-    phase_state = 0.0
     freq = 1.5
-    locked = False
-
-    for i in range(memory_window, len(t)):
-        # Predict using memory
-        memory = input_signal[i-memory_window:i]
-        mean_mem = np.mean(memory)
-        signal = (np.sin(2 * np.pi * freq * t[i] + phase_state) + 1) / 2
-
-        # Gate opens based on memory resonance
-        if mean_mem > 0.2:
-            gate[i] = signal
-
-        # Locking logic
-        if not locked and mean_mem > 0.25:
-            locked = True
-            phase_state += 0.1  # Shift to stabilize
-        elif locked:
-            phase_state += 0.02  # Sustain lock
-        else:
-            phase_state -= 0.01  # Drift if not stable
-
-        freq = np.clip(freq, 1.0, 2.5)
-        phase_state = np.clip(phase_state, 0, 2 * np.pi)
-
+    # Predict using memory
+    mean_mem = rolling_mean(input_signal, memory_window)
+
+    # Locking logic: the phase drifts down but is clipped at 0 until the first
+    # step with mean_mem > 0.25, shifts by 0.1 there, then sustains +0.02 per
+    # step up to 2π. Each step's signal uses the phase from before its update.
+    phase_state = np.zeros(len(t))
+    lock_steps = np.flatnonzero(mean_mem > 0.25)
+    if lock_steps.size:
+        i_lock = lock_steps[0]
+        steps_after = np.arange(len(t) - i_lock - 1)
+        phase_state[i_lock + 1:] = np.minimum(0.1 + 0.02 * steps_after, 2 * np.pi)
+
+    # Gate opens based on memory resonance
+    gate = np.where(mean_mem > 0.2, oscillator(t, freq, phase_state), 0.0)
     return gaussian_filter1d(gate, sigma=2)
 
 # Apply phase lock
@@ -53,9 +43,6 @@ def theta_bar(input_signal):
 def delta_G(input_signal):
     return -np.gradient(input_signal)
 
-def mutual_info_proxy(I, O):
-    return np.correlate(I - np.mean(I), O - np.mean(O), mode='same') / len(I)
-
 theta = theta_bar(G_lock)
 dG = delta_G(theta)
 MI_proxy = mutual_info_proxy(I_t, O_lock)
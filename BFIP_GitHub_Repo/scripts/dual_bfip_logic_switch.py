@@ -1,23 +1,17 @@
 
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
-from thermo_dynamic_model import run_dynamic_thermo
+from thermo_dynamic_model import run_dynamic_thermo_cached as run_dynamic_thermo
+from models.cache import configure_cache, format_stats
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi
 
 R_gas = 8.314
 THR_THETA = 0.10
 THR_MI = 2.2
 MI_PERTURB = 0.50
 
-def compute_mi(theta_base, theta_pert):
-    hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-    pXY = hist2d / np.sum(hist2d)
-    pX = np.sum(pXY, axis=1)
-    pY = np.sum(pXY, axis=0)
-    mask = pXY > 0
-    denom = np.outer(pX, pY)
-    return np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
 def generate_pulse_wave(t_span, low=0.10, high=0.30, period=60):
     pulse_wave = []
     for t in t_span:
@@ -69,6 +63,13 @@ def plot_logic_trace(t, amps, logic_states):
     plt.show()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Dual-ion BFIP logic switching under a pulsed amplitude")
+    parser.add_argument('--cache', nargs='?', const='', default=None, metavar='DIR',
+                        help='Reuse run_dynamic_thermo results: in memory, or also on disk under DIR')
+    args = parser.parse_args()
+    if args.cache is not None:
+        configure_cache(args.cache or None)
+
     # Pick known BFIP-stable points from previous simulations
     dH_H = -46.8421
     dS_H = -0.1021
@@ -76,4 +77,6 @@ if __name__ == '__main__':
     dS_Ca = -0.110
 
     t, amps, logic_states, logic_labels = simulate_dual_bfip(dH_H, dS_H, dH_Ca, dS_Ca)
+    if args.cache is not None:
+        print(format_stats())
     plot_logic_trace(t, amps, logic_states)
@@ -7,10 +7,76 @@ import csv, time, os
 from ion_phase_lab.models.kinetics import hill_equation, binding_dynamics, dynamic_ligand_base
 from ion_phase_lab.models.thermodynamics import gibbs_free_energy
 from ion_phase_lab.models.information import compute_mutual_information
+from ion_phase_lab.models.result_store import write_results
 
 import os
 
-def run_bfip_engine(output_path=None):
+def _batched_rows(ion, params, thr, temperatures, time_series, bind_ode):
+    """
+    Evaluate one ion's (conc × pH × T) grid with array broadcasting.
+
+    The Hill curve, θ*, L* and pP only depend on the ion; ΔG only on T; the
+    binding ODE only on pH (through k_on/k_off). Each factor is computed once
+    on its own axis, all pH trajectories are integrated together as one vector
+    ODE, and the threshold test is broadcast back over the full grid.
+    Rows come back in the same (conc, pH, T) order as the nested loops.
+    """
+    concs = np.linspace(*params['conc_range'])
+    pHs = np.linspace(*params['pH_range'])
+    Ls = np.linspace(*params['lig_range'])
+
+    # Ion-only quantities: Hill curve, steepest point, parameter marginal
+    theta_arr = hill_equation(Ls, params['n_H'], params['K_d'])
+    idx = np.argmax(np.gradient(theta_arr, Ls))
+    L_star = Ls[idx]
+    theta_s = hill_equation(L_star, params['n_H'], params['K_d'])
+    grid = np.linspace(0, 1, 100)
+    pP = norm.pdf(grid, np.mean(theta_arr), 0.05); pP /= pP.sum()
+
+    # T-only quantities
+    G_s = gibbs_free_energy(theta_s, params['dH'], params['dS'], temperatures)
+    RTln2 = 8.314 * temperatures/1000 * np.log(2)
+
+    # pH-only quantities: one vector ODE over every pH value
+    k_on  = params['k_on'] * (1 - 0.1*(pHs-7.4)**2)
+    k_off = params['k_off'] * (1 + 0.1*(pHs-7.4)**2)
+    lig_fn = dynamic_ligand_base(Ls[len(Ls)//2], 1.0)
+    theta0 = np.full(len(pHs), 0.5)
+    # Each θ_i only depends on itself, so the Jacobian is diagonal (ml=mu=0)
+    dyn = odeint(bind_ode, theta0, time_series, args=(ion, lig_fn, k_on, k_off, pHs),
+                 ml=0, mu=0).T
+
+    # Row-wise np.histogram(bins=50, range=(0,1), density=True)
+    n_bins = 50
+    inside = (dyn >= 0.0) & (dyn <= 1.0)
+    bins = np.clip((dyn * n_bins).astype(int), 0, n_bins - 1)
+    bins = bins + n_bins * np.arange(len(pHs))[:, None]
+    counts = np.bincount(bins[inside], minlength=n_bins*len(pHs)).reshape(len(pHs), n_bins)
+    hist = counts * n_bins / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    pF = np.clip(hist, 1e-12, None)
+    # One call for every pH: joints (pH, P, F) against the shared pP
+    MI = compute_mutual_information(pP[:, None] * pF[:, None, :], pP, pF)
+
+    # Broadcast the predicate over (conc, pH, T)
+    is_bfip = ((MI > thr['MI'])[:, None]
+               & (theta_s > thr['theta'])
+               & (G_s < -thr['n_RTln2']*RTln2)[None, :])
+    is_bfip = np.broadcast_to(is_bfip, (len(concs), len(pHs), len(temperatures)))
+
+    rows = []
+    for i, j, k in np.argwhere(is_bfip):
+        rows.append([ion, concs[i], pHs[j], temperatures[k], L_star, theta_s, MI[j], G_s[k]])
+    return rows
+
+
+def run_bfip_engine(output_path=None, batched=False, store_path=None):
+    """
+    Sweep every ion over its (conc, pH, T) grid and export BFIP points to CSV.
+    With batched=True the grid is evaluated by _batched_rows instead of the
+    per-cell loops; both modes write the same rows in the same order.
+    store_path additionally writes the rows to a result store (see
+    models.result_store) with the thresholds and grid specs as metadata.
+    """
     if output_path is None:
         base_dir = os.path.dirname(__file__)
         output_path = os.path.join(base_dir, 'results', 'bfip_points.csv')
@@ -56,6 +122,10 @@ def run_bfip_engine(output_path=None):
 
     for ion, params in ion_params.items():
         thr = targets[ion]
+        if batched:
+            csv_rows.extend(_batched_rows(ion, params, thr, temperatures, time_series, bind_ode))
+            continue
+
         concs = np.linspace(*params['conc_range'])
         pHs = np.linspace(*params['pH_range'])
         Ls = np.linspace(*params['lig_range'])
@@ -98,5 +168,22 @@ def run_bfip_engine(output_path=None):
 
     print(f"Exported {len(csv_rows)} BFIP points to {output_path}")
 
+    if store_path is not None:
+        names = ['ion', 'conc', 'pH', 'T', 'L_star', 'theta_star', 'MI', 'G_S']
+        columns = {name: [row[k] for row in csv_rows] for k, name in enumerate(names)}
+        write_results(store_path, columns, axes={'T': temperatures}, metadata={
+            'source': 'engine.run_bfip_engine',
+            'targets': targets,
+            'ion_params': ion_params,
+            'time_series': [0, 200, 200],
+        })
+        print(f"Wrote {len(csv_rows)} BFIP points to result store {store_path}")
+
 if __name__ == "__main__":
-    run_bfip_engine()
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the BFIP engine over the (ion, conc, pH, T) grid")
+    parser.add_argument('--output', default=None, help='CSV output path (default: results/bfip_points.csv)')
+    parser.add_argument('--batched', action='store_true', help='Evaluate each ion grid with array broadcasting')
+    parser.add_argument('--store', default=None, help='Also write the rows to this result-store directory')
+    args = parser.parse_args()
+    run_bfip_engine(output_path=args.output, batched=args.batched, store_path=args.store)
@@ -20,21 +20,19 @@ import os, sys
 # ensure models/ is on the import path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from models.kinetics import hill_equation
-from models.thermodynamics import gibbs_free_energy
-from models.information import compute_mutual_information
+from models.static_fields import evaluate_mesh
+from models.result_store import write_results, grid_columns
 
 # BFIP thresholds and MI perturbation
 THR_THETA  = 0.05    # binding saturation threshold
 THR_MI     = 0.01    # lowered MI threshold
 MI_PERTURB = 0.10    # 10% perturbation
-R_gas      = 8.314   # J/(mol·K)
 
 def load_config(path):
     with open(path) as f:
         return yaml.safe_load(f)
 
-def run_contour(ion, cfg, out_png):
+def run_contour(ion, cfg, out_png, store_path=None, resolution=200):
     ion_cfg = cfg['ions'][ion]
 
     # fixed thermodynamics and affinity
@@ -47,27 +45,14 @@ def run_contour(ion, cfg, out_png):
     T_min, T_max = cfg['T_range']
     L_min, L_max, _ = ion_cfg['ligand_range']
 
-    T_vals = np.linspace(T_min, T_max, 200)
-    L_vals = np.linspace(L_min, L_max, 200)
-    T_grid, L_grid = np.meshgrid(T_vals, L_vals, indexing='ij')
+    T_vals = np.linspace(T_min, T_max, resolution)
+    L_vals = np.linspace(L_min, L_max, resolution)
 
-    RTln2_grid = (R_gas * T_grid / 1000) * np.log(2)
-
-    Z = np.zeros_like(T_grid, dtype=bool)
-
-    for i, T in enumerate(T_vals):
-        for j, L in enumerate(L_vals):
-            # θ* at this L
-            theta = hill_equation(np.array([L]), n_H, Kd_mean)[0]
-            # ΔG at θ*
-            G = gibbs_free_energy(theta, dH_mean, dS_mean, T)
-            # MI around θ*
-            P = np.array([1-theta, theta])
-            Q = np.array([1-theta*(1+MI_PERTURB), theta*(1+MI_PERTURB)])
-            pJ = np.outer(P, Q)
-            MI = compute_mutual_information(pJ, P, Q)
-
-            Z[i,j] = (theta > THR_THETA) and (MI > THR_MI) and (G < -RTln2_grid[i,j])
+    # θ*, ΔG and MI on the whole (T, L) mesh at once; the ΔG cut is -RT·ln2 per cell
+    fields = evaluate_mesh({'T': T_vals, 'L': L_vals},
+                           {'L': 'L', 'K_d': Kd_mean, 'n_H': n_H, 'dH': dH_mean, 'dS': dS_mean, 'T': 'T'},
+                           THR_THETA, THR_MI, mi_perturb=MI_PERTURB)
+    Z = fields['bfip']
 
     # Plotting
     plt.figure(figsize=(6,5))
@@ -80,11 +65,20 @@ def run_contour(ion, cfg, out_png):
     plt.savefig(out_png)
     print(f'Saved T–[L] BFIP contour to {out_png}')
 
+    if store_path is not None:
+        axes = {'T': T_vals, 'L': L_vals}
+        write_results(store_path, grid_columns(axes, **fields), axes=axes,
+                      metadata={'ion': ion, 'dH': dH_mean, 'dS': dS_mean, 'K_d': Kd_mean, 'n_H': n_H,
+                                'thresholds': {'theta': THR_THETA, 'MI': THR_MI}, 'MI_perturb': MI_PERTURB})
+        print(f'Saved raw grid to result store {store_path}')
+
 if __name__ == '__main__':
     p = argparse.ArgumentParser(description='Plot BFIP contour in T–ligand space')
     p.add_argument('--ion',    required=True, help='Ion name, e.g. Fe2+')
     p.add_argument('--config', default='pipeline/config.yaml', help='Path to config.yaml')
     p.add_argument('--out',    default='bfip_T_Lig_contour.png', help='Output PNG filename')
+    p.add_argument('--resolution', type=int, default=200, help='Grid points per axis')
+    p.add_argument('--store',  default=None, help='Also write the raw grid to this result-store directory')
     args = p.parse_args()
     cfg = load_config(args.config)
-    run_contour(args.ion, cfg, args.out)
+    run_contour(args.ion, cfg, args.out, store_path=args.store, resolution=args.resolution)
@@ -19,9 +19,8 @@ import os, sys
 toplevel = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, toplevel)
 
-from models.kinetics import hill_equation
-from models.thermodynamics import gibbs_free_energy
-from models.information import compute_mutual_information
+from models.static_fields import evaluate_mesh
+from models.result_store import write_results, grid_columns
 
 # BFIP thresholds (hardcoded, adjusted for MI sensitivity)
 THR_THETA   = 0.05    # binding saturation threshold
@@ -36,7 +35,7 @@ def load_config(path):
         return yaml.safe_load(f)
 
 
-def run_contour(ion, cfg, out_png):
+def run_contour(ion, cfg, out_png, store_path=None, resolution=200):
     ion_cfg = cfg['ions'][ion]
     # fixed thermodynamics
     dH0 = ion_cfg['Delta_H']['mean']
@@ -47,34 +46,19 @@ def run_contour(ion, cfg, out_png):
     # sweep ligand and Kd
     lig_vals = ion_cfg['ligand_range']
     Lmin, Lmax = lig_vals[0], lig_vals[1]
-    L = np.linspace(Lmin, Lmax, 200)
+    L = np.linspace(Lmin, Lmax, resolution)
     Kd0 = ion_cfg['K_d']['mean']
     sigma_Kd = ion_cfg['K_d']['std']
-    Kd = np.linspace(max(1e-6, Kd0 - 3*sigma_Kd), Kd0 + 3*sigma_Kd, 200)
+    Kd = np.linspace(max(1e-6, Kd0 - 3*sigma_Kd), Kd0 + 3*sigma_Kd, resolution)
     K, Lg = np.meshgrid(Kd, L, indexing='ij')
 
-    # preparatory
     n_H = ion_cfg['n_H']['mean']
-    RTln2 = 8.314 * T0/1000 * np.log(2)
 
-    Z = np.zeros(K.shape, dtype=bool)
-    for i, kd in enumerate(Kd):
-        # theta*_nominal at kd
-        theta_s = hill_equation(np.array([kd]), n_H, kd)[0]
-        G_s = gibbs_free_energy(theta_s, dH0, dS0, T0)
-        for j, lig in enumerate(L):
-            # MI: compare theta curves at nominal vs slight Kd shift
-            theta_ref = hill_equation(np.array([lig]), n_H, kd)[0]
-            # small perturb of kd
-            kp = kd * 1.01
-            theta_samp = hill_equation(np.array([lig]), n_H, kp)[0]
-            # discrete MI
-            P = np.array([1-theta_s, theta_s])
-            Q = np.array([1-theta_s*(1+MI_PERTURB), theta_s*(1+MI_PERTURB)])
-            pJ = np.outer(P, Q)
-            MI = compute_mutual_information(pJ, P, Q)
-
-            Z[i,j] = (theta_s > THR_THETA) and (MI > THR_MI) and (G_s < -THR_n * RTln2)
+    # θ*_nominal is taken at [L] = K_d, so every field varies along K_d only
+    fields = evaluate_mesh({'K_d': Kd, 'L': L},
+                           {'L': 'K_d', 'K_d': 'K_d', 'n_H': n_H, 'dH': dH0, 'dS': dS0, 'T': T0},
+                           THR_THETA, THR_MI, n_RTln2=THR_n, mi_perturb=MI_PERTURB)
+    Z = fields['bfip']
 
     plt.figure(figsize=(6,5))
     cs = plt.contourf(K, Lg, Z.T, levels=[-0.5, 0.5, 1.5], cmap='plasma')
@@ -86,11 +70,20 @@ def run_contour(ion, cfg, out_png):
     plt.savefig(out_png)
     print(f'Saved BFIP contour map to {out_png}')
 
+    if store_path is not None:
+        axes = {'K_d': Kd, 'L': L}
+        write_results(store_path, grid_columns(axes, **fields), axes=axes,
+                      metadata={'ion': ion, 'dH': dH0, 'dS': dS0, 'T0': T0, 'n_H': n_H,
+                                'thresholds': {'theta': THR_THETA, 'MI': THR_MI, 'n_RTln2': THR_n}, 'MI_perturb': MI_PERTURB})
+        print(f'Saved raw grid to result store {store_path}')
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Plot BFIP contour in Kd–Lig')
     parser.add_argument('--ion',   required=True, help='Ion name, e.g. Fe2+')
     parser.add_argument('--config',default='pipeline/config.yaml', help='Path to config.yaml')
     parser.add_argument('--out',   default='bfip_Kd_Lig_contour.png', help='Output PNG')
+    parser.add_argument('--resolution', type=int, default=200, help='Grid points per axis')
+    parser.add_argument('--store', default=None, help='Also write the raw grid to this result-store directory')
     args = parser.parse_args()
     cfg = load_config(args.config)
-    run_contour(args.ion, cfg, args.out)
+    run_contour(args.ion, cfg, args.out, store_path=args.store, resolution=args.resolution)
@@ -17,8 +17,11 @@ sys.path.insert(0, toplevel)
 sys.path.insert(0, os.path.join(toplevel, 'simulation'))
 
 from models.simulation import run_dynamic
-from models.information import compute_mutual_information
+from sweep_executor import sweep_grid, sweep_points
+from models.information import compute_mutual_information, compute_mi
 from models.thermodynamics import gibbs_free_energy
+from models.result_store import write_results, grid_columns
+from models.surrogate import active_scan, format_cv
 
 # Thresholds
 THR_THETA   = 0.10
@@ -30,7 +33,39 @@ def load_config(path):
     with open(path) as f:
         return yaml.safe_load(f)
 
-def run_contour_maps(ion, cfg, base_out):
+def contour_cell(dH, dS, ion_cfg, lig_range, T0, t_span):
+    """Simulate one (ΔH, ΔS) cell; returns (BFIP flag, MI, θ̄, ΔG)"""
+    print(f"→ ΔH = {dH:.1f}, ΔS = {dS:.2f}", flush=True)
+
+    kin_base = {
+        'k_on': ion_cfg['k_on']['mean'],
+        'k_off': ion_cfg['k_off']['mean'],
+        'amplitude': ion_cfg.get('amplitude', 1.0)
+    }
+    t, theta_base = run_dynamic(kin_base, lig_range, T0, t_span)
+
+    kin_pert = {
+        'k_on': kin_base['k_on'],
+        'k_off': kin_base['k_off'] * (1 + MI_PERTURB),
+        'amplitude': kin_base['amplitude'] * (1 - MI_PERTURB)
+    }
+    _, theta_pert = run_dynamic(kin_pert, lig_range, T0, t_span)
+
+    # MI Calculation
+    mi_dyn = compute_mi(theta_base, theta_pert)
+
+    theta_mean = np.mean(theta_base)
+    G = gibbs_free_energy(theta_mean, dH, dS, T0)
+
+    is_bfip = (
+        (theta_mean > THR_THETA) and
+        (mi_dyn > THR_MI) and
+        (G < - (R_gas * T0 / 1000) * np.log(2))
+    )
+    return is_bfip, mi_dyn, theta_mean, G
+
+def run_contour_maps(ion, cfg, base_out, workers=1, surrogate=False, resolution=20, max_true=200,
+                     store_path=None):
     ion_cfg = cfg['ions'][ion]
 
     dH0       = ion_cfg['Delta_H']['mean']
@@ -41,52 +76,30 @@ def run_contour_maps(ion, cfg, base_out):
 
     spanH = ion_cfg['Delta_H']['std'] * 2
     spanS = ion_cfg['Delta_S']['std'] * 2
-    H_vals = np.linspace(dH0 - spanH, dH0 + spanH, 20)
-    S_vals = np.linspace(dS0 - spanS, dS0 + spanS, 20)
+    H_vals = np.linspace(dH0 - spanH, dH0 + spanH, resolution)
+    S_vals = np.linspace(dS0 - spanS, dS0 + spanS, resolution)
     H, S = np.meshgrid(H_vals, S_vals, indexing='ij')
 
-    Z = np.zeros_like(H, dtype=bool)
-    MI_map = np.zeros_like(H)
-    THETA_map = np.zeros_like(H)
-
-    for i, dH in enumerate(H_vals):
-        for j, dS in enumerate(S_vals):
-            print(f"→ ΔH = {dH:.1f}, ΔS = {dS:.2f}", flush=True)
-
-            kin_base = {
-                'k_on': ion_cfg['k_on']['mean'],
-                'k_off': ion_cfg['k_off']['mean'],
-                'amplitude': ion_cfg.get('amplitude', 1.0)
-            }
-            t, theta_base = run_dynamic(kin_base, lig_range, T0, t_span)
-
-            kin_pert = {
-                'k_on': kin_base['k_on'],
-                'k_off': kin_base['k_off'] * (1 + MI_PERTURB),
-                'amplitude': kin_base['amplitude'] * (1 - MI_PERTURB)
-            }
-            _, theta_pert = run_dynamic(kin_pert, lig_range, T0, t_span)
-
-            # MI Calculation
-            hist2d, _, _ = np.histogram2d(theta_base, theta_pert, bins=30)
-            pXY = hist2d / np.sum(hist2d)
-            pX = np.sum(pXY, axis=1)
-            pY = np.sum(pXY, axis=0)
-            mask = pXY > 0
-            denom = np.outer(pX, pY)
-            mi_dyn = np.sum(pXY[mask] * np.log(pXY[mask] / denom[mask]))
-
-            theta_mean = np.mean(theta_base)
-            G = gibbs_free_energy(theta_mean, dH, dS, T0)
-
-            MI_map[i, j] = mi_dyn
-            THETA_map[i, j] = theta_mean
-
-            Z[i, j] = (
-                (theta_mean > THR_THETA) and
-                (mi_dyn > THR_MI) and
-                (G < - (R_gas * T0 / 1000) * np.log(2))
-            )
+    if surrogate:
+        # Emulate θ̄ / MI / ΔG; simulate only where the BFIP bit is uncertain
+        def simulate(X):
+            cells = sweep_points(contour_cell, [tuple(x) for x in X], workers=workers,
+                                 ion_cfg=ion_cfg, lig_range=lig_range, T0=T0, t_span=t_span)
+            return np.array([(theta, mi, G) for _, mi, theta, G in cells])
+
+        scan = active_scan(simulate, np.column_stack([H.ravel(), S.ravel()]),
+                           [(H_vals[0], H_vals[-1]), (S_vals[0], S_vals[-1])], max_true=max_true,
+                           thresholds={'thr_theta': THR_THETA, 'thr_mi': THR_MI, 'T': T0})
+        print(f"{scan['n_true']} true simulations for {H.size} cells; {format_cv(scan['cv'])}")
+        Z = scan['bfip'].reshape(H.shape)
+        THETA_map, MI_map, DG_map = (scan['mean'][:, k].reshape(H.shape) for k in range(3))
+    else:
+        cells = sweep_grid(contour_cell, H_vals, S_vals, workers=workers,
+                           ion_cfg=ion_cfg, lig_range=lig_range, T0=T0, t_span=t_span)
+        Z = cells[..., 0].astype(bool)
+        MI_map = cells[..., 1]
+        THETA_map = cells[..., 2]
+        DG_map = cells[..., 3]
 
     # Plot BFIP binary region
     plt.figure(figsize=(6, 5))
@@ -120,11 +133,25 @@ def run_contour_maps(ion, cfg, base_out):
 
     print(f"✅ Saved Z, MI, and θ̄ plots to {base_out}_*.png")
 
+    if store_path is not None:
+        axes = {'dH': H_vals, 'dS': S_vals}
+        write_results(store_path, grid_columns(axes, bfip=Z, MI=MI_map, theta_mean=THETA_map, dG=DG_map), axes=axes,
+                      metadata={'ion': ion, 'T0': T0, 'thresholds': {'theta': THR_THETA, 'MI': THR_MI}, 'MI_perturb': MI_PERTURB,
+                                'surrogate': surrogate})
+        print(f'Saved raw grid to result store {store_path}')
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Plot BFIP + MI + θ maps')
     parser.add_argument('--ion',    required=True, help='Ion name, e.g. Ca2+')
     parser.add_argument('--config', default='pipeline/config.yaml', help='Path to config.yaml')
     parser.add_argument('--out',    default='Ca2_maps', help='Base output name (no extension)')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for the ΔH/ΔS sweep (0 = all cores)')
+    parser.add_argument('--resolution', type=int, default=20, help='Grid points per axis')
+    parser.add_argument('--surrogate', action='store_true',
+                        help='Emulate the maps with a GP, simulating only near the BFIP boundary')
+    parser.add_argument('--max-true', type=int, default=200, help='True-simulation budget in surrogate mode')
+    parser.add_argument('--store',  default=None, help='Also write the raw grid to this result-store directory')
     args = parser.parse_args()
     cfg = load_config(args.config)
-    run_contour_maps(args.ion, cfg, args.out)
+    run_contour_maps(args.ion, cfg, args.out, workers=args.workers, surrogate=args.surrogate,
+                     resolution=args.resolution, max_true=args.max_true, store_path=args.store)
@@ -19,15 +19,13 @@ import os, sys
 toplevel = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, toplevel)
 
-from models.kinetics import hill_equation
-from models.thermodynamics import gibbs_free_energy
-from models.information import compute_mutual_information
+from models.static_fields import evaluate_mesh
+from models.result_store import write_results, grid_columns
 
 # BFIP thresholds and MI perturbation
 THR_THETA  = 0.05   # binding saturation
 THR_MI     = 0.01   # lowered mutual-information threshold
 MI_PERTURB = 0.10   # 10% perturbation around θ for MI
-RT = 8.314 / 1000  # kJ/(mol·K)
 
 
 def load_config(path):
@@ -35,7 +33,7 @@ def load_config(path):
         return yaml.safe_load(f)
 
 
-def run_contour(ion, cfg, out_png):
+def run_contour(ion, cfg, out_png, store_path=None, resolution=200):
     ion_cfg = cfg['ions'][ion]
     # fixed thermodynamics
     dH = ion_cfg.get('Delta_H',{}).get('mean', ion_cfg.get('dH',{}).get('mean'))
@@ -63,24 +61,14 @@ def run_contour(ion, cfg, out_png):
     else:
         raise KeyError("Ligand range not found in config for ion")
 
-    pH_vals = np.linspace(pH_min, pH_max, 200)
-    L_vals  = np.linspace(L_min, L_max, 200)
+    pH_vals = np.linspace(pH_min, pH_max, resolution)
+    L_vals  = np.linspace(L_min, L_max, resolution)
 
-    Z = np.zeros((len(pH_vals), len(L_vals)), dtype=bool)
-    for i, pH in enumerate(pH_vals):
-        for j, Lg in enumerate(L_vals):
-         for j, Lg in enumerate(L_vals):
-            # binding saturation at Lg
-            theta = hill_equation(np.array([Lg]), n_H, Kd)[0]
-            # Gibbs free energy at theta
-            G = gibbs_free_energy(theta, dH, dS, T0)
-            # MI: discrete two-point around theta
-            P_dist = np.array([1 - theta, theta])
-            Q_dist = np.array([1 - theta * (1 + MI_PERTURB), theta * (1 + MI_PERTURB)])
-            pJ = np.outer(P_dist, Q_dist)
-            MI = compute_mutual_information(pJ, P_dist, Q_dist)
-            # BFIP condition
-            Z[i, j] = (theta > THR_THETA) and (MI > THR_MI) and (G < -RT * np.log(2))
+    # θ* depends on [L] only, so the pH axis just broadcasts
+    fields = evaluate_mesh({'pH': pH_vals, 'L': L_vals},
+                           {'L': 'L', 'K_d': Kd, 'n_H': n_H, 'dH': dH, 'dS': dS, 'T': T0},
+                           THR_THETA, THR_MI, mi_perturb=MI_PERTURB)
+    Z = fields['bfip']
 
     # plot
     plt.figure(figsize=(6,5))
@@ -93,11 +81,20 @@ def run_contour(ion, cfg, out_png):
     plt.savefig(out_png)
     print(f'Saved BFIP pH–[L] contour to {out_png}')
 
+    if store_path is not None:
+        axes = {'pH': pH_vals, 'L': L_vals}
+        write_results(store_path, grid_columns(axes, **fields), axes=axes,
+                      metadata={'ion': ion, 'dH': dH, 'dS': dS, 'T0': T0, 'K_d': Kd, 'n_H': n_H,
+                                'thresholds': {'theta': THR_THETA, 'MI': THR_MI}, 'MI_perturb': MI_PERTURB})
+        print(f'Saved raw grid to result store {store_path}')
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Plot BFIP contour in pH–ligand space')
     parser.add_argument('--ion',    required=True, help='Ion name, e.g. Fe2+')
     parser.add_argument('--config', default='pipeline/config.yaml', help='Path to config.yaml')
     parser.add_argument('--out',    default='bfip_pH_Lig_contour.png', help='Output PNG')
+    parser.add_argument('--resolution', type=int, default=200, help='Grid points per axis')
+    parser.add_argument('--store',  default=None, help='Also write the raw grid to this result-store directory')
     args = parser.parse_args()
     cfg = load_config(args.config)
-    run_contour(args.ion, cfg, args.out)
+    run_contour(args.ion, cfg, args.out, store_path=args.store, resolution=args.resolution)
@@ -29,7 +29,7 @@ def run_simulation(output_dir, ion_name):
         "RT": RT
     }
 
-    Z_map = np.zeros((20, 20))
+    Z_map = np.zeros((20, 20), dtype=np.uint8)
     THETA_map = np.zeros((20, 20))
     MI_map = np.zeros((20, 20))
 
@@ -0,0 +1,99 @@
+# BFIP Parameter Sweep Simulator
+# Explores where BFIP activation occurs across ΔG₀ and ligand space, for any number of ions
+#
+# Usage:
+#   python parameter_sweep_simulator.py --ions Fe2plus Mg2plus Zn2plus --temp 310.15 --resolution 100
+
+import argparse
+import os
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+LIGAND_RANGE = (0.01, 10)
+DELTAG0_RANGE = (-30, 0)
+CHUNK_CELLS = 1 << 22     # grid cells evaluated per block of ΔG₀ rows
+PLOT_MAX = 800            # figures are 8 in wide at 100 dpi; finer grids are strided down
+
+# colour maps of the former per-ion scripts, so regenerated figures look the same
+ION_CMAPS = {'Fe2plus': 'magma', 'Mg2plus': 'plasma', 'Zn2plus': 'cividis'}
+
+
+def calculate_free_energy(ligand, deltaG0, RT):
+    return deltaG0 + RT * np.log(ligand + 1e-8)
+
+def calculate_theta(deltaG, RT):
+    return 1 / (1 + np.exp(deltaG / RT))
+
+def calculate_mutual_information(theta):
+    eps = 1e-8
+    theta = np.clip(theta, eps, 1 - eps)
+    return -(theta * np.log2(theta) + (1 - theta) * np.log2(1 - theta))
+
+def bfip_map(deltaG0_range, ligand_range, temp):
+    """
+    BFIP activation over the (ΔG₀, ligand) grid as a uint8 0/1 array.
+
+    ΔG₀ runs down the rows and ligand along the columns, like the old
+    BFIP_map. ΔG₀ + RT·ln(L) is evaluated by broadcasting a column against a
+    row, in blocks of rows so temporaries stay bounded.
+    """
+    RT = 8.314 * temp / 1000
+    log_term = calculate_free_energy(np.asarray(ligand_range), 0.0, RT)[None, :]
+    out = np.zeros((len(deltaG0_range), len(ligand_range)), dtype=np.uint8)
+    step = max(1, CHUNK_CELLS // len(ligand_range))
+    for start in range(0, len(deltaG0_range), step):
+        dG = np.asarray(deltaG0_range[start:start + step])[:, None] + log_term
+        theta = calculate_theta(dG, RT)
+        mi = calculate_mutual_information(theta)
+        out[start:start + step] = (theta > 0.1) & (mi > 0.5) & (dG < -RT * np.log(2))
+    return out
+
+def run_parameter_sweep(ions=("NewIon",), temp=310.15, resolution=100, output_dir="sweep_results",
+                        plot=True, show=False):
+    """
+    Sweep every ion over the ΔG₀ × ligand grid and save {ion}_BFIP_sweep.npy
+    (and .png) per ion.
+
+    The BFIP test depends only on ΔG₀, ligand and temperature, so the map is
+    evaluated once and broadcast over the ion axis. Returns the
+    (ion, ΔG₀, ligand) stack as a read-only view.
+    """
+    ligand_range = np.linspace(*LIGAND_RANGE, resolution)
+    deltaG0_range = np.linspace(*DELTAG0_RANGE, resolution)
+    maps = np.broadcast_to(bfip_map(deltaG0_range, ligand_range, temp),
+                           (len(ions), resolution, resolution))
+
+    os.makedirs(output_dir, exist_ok=True)
+    stride = -(-resolution // PLOT_MAX)
+    for ion_name, BFIP_map in zip(ions, maps):
+        np.save(os.path.join(output_dir, f"{ion_name}_BFIP_sweep.npy"), BFIP_map)
+        if not plot:
+            continue
+        plt.figure(figsize=(8, 6))
+        plt.imshow(BFIP_map[::stride, ::stride], extent=[*LIGAND_RANGE, *DELTAG0_RANGE], aspect='auto',
+                   origin='lower', cmap=ION_CMAPS.get(ion_name, 'viridis'))
+        plt.colorbar(label="BFIP Activated (1=True, 0=False)")
+        plt.xlabel("Ligand Concentration")
+        plt.ylabel("ΔG₀ (kcal/mol)")
+        plt.title(f"BFIP Phase Activation Sweep: {ion_name}")
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, f"{ion_name}_BFIP_sweep.png"))
+        if show:
+            plt.show()
+        plt.close()
+
+    print(f"✅ Sweep completed for {', '.join(ions)}. Data saved in '{output_dir}'")
+    return maps
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BFIP activation sweep over ΔG₀ and ligand concentration")
+    parser.add_argument('--ions', nargs='+', default=["NewIon"], help='Ion names, e.g. Fe2plus Mg2plus Zn2plus')
+    parser.add_argument('--temp', type=float, default=310.15, help='Temperature in Kelvin')
+    parser.add_argument('--resolution', type=int, default=100, help='Grid points per axis')
+    parser.add_argument('--output-dir', default="sweep_results", help='Directory for the .npy/.png outputs')
+    parser.add_argument('--no-plot', action='store_true', help='Only save the .npy maps')
+    parser.add_argument('--show', action='store_true', help='Display each figure after saving it')
+    args = parser.parse_args()
+    run_parameter_sweep(args.ions, args.temp, args.resolution, args.output_dir,
+                        plot=not args.no_plot, show=args.show)
@@ -5,6 +5,7 @@ run_sensitivity.py
 Compute Sobol sensitivity indices for BFIP metrics (MI, θ*, ΔG) using a KDE-based MI estimator.
 Usage:
   python run_sensitivity.py --ion Fe2+ --metric mi --config pipeline/config.yaml --output sobol_Fe2.csv
+  python run_sensitivity.py --ion Fe2+ --N 4096 --second-order --mi-estimator histogram --workers 8
 """
 import os
 import sys
@@ -12,17 +13,22 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import yaml
 import numpy as np
 from SALib.sample import sobol as salib_sobol_sample
 from SALib.analyze import sobol as salib_sobol_analyze
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.feature_selection import mutual_info_regression
 
 # Import BFIP model functions
 from models.kinetics import hill_equation
 from models.thermodynamics import gibbs_free_energy
+from models.information import compute_mi, knn_mutual_information
+
+# 'knn' reproduces sklearn's mutual_info_regression in batched NumPy;
+# 'sklearn' calls it per sample; 'histogram' and 'gaussian' are cheaper
+MI_ESTIMATORS = ('knn', 'sklearn', 'histogram', 'gaussian')
 
 
 def load_config(path):
@@ -82,31 +88,107 @@ def compute_static_metrics(params, ion_cfg, temp_range):
     theta_ref  = hill_equation(lig_grid, n_H, Kd_nominal)
     theta_samp = hill_equation(lig_grid, n_H, Kd_sample)
     theta_ref_reshaped = theta_ref.reshape(-1, 1)
+    from sklearn.feature_selection import mutual_info_regression
     MI_kde = mutual_info_regression(theta_ref_reshaped, theta_samp, discrete_features=False, random_state=0)
     MI = MI_kde[0]
     return {'mi': MI, 'theta': theta_nom, 'deltaG': G_s}
 
 
+def _sklearn_mi_chunk(theta_ref, theta_samp):
+    from sklearn.feature_selection import mutual_info_regression
+    X = theta_ref.reshape(-1, 1)
+    return [mutual_info_regression(X, row, discrete_features=False, random_state=0)[0] for row in theta_samp]
+
+
+def batch_mi(theta_ref, theta_samp, estimator='knn', workers=1, chunk_size=256):
+    """
+    MI between one reference curve and each row of theta_samp (n, len(curve)).
+
+    The 'knn' and 'sklearn' paths run in chunks of chunk_size rows, spread
+    over `workers` processes when workers > 1 (0 or None uses every core).
+    """
+    if estimator not in MI_ESTIMATORS:
+        raise ValueError(f"Unknown MI estimator '{estimator}' (expected one of {MI_ESTIMATORS})")
+    if estimator == 'gaussian':
+        # I = -½·ln(1 - ρ²) for jointly Gaussian variables
+        ref = theta_ref - theta_ref.mean()
+        samp = theta_samp - theta_samp.mean(axis=1, keepdims=True)
+        denom = np.sqrt((ref ** 2).sum() * (samp ** 2).sum(axis=1))
+        rho = np.where(denom > 0, samp @ ref / np.where(denom > 0, denom, 1.0), 0.0)
+        return -0.5 * np.log(np.maximum(1 - rho ** 2, 1e-300))
+    if estimator == 'histogram':
+        # same estimator as mutual_information_histogram (bins=20), all rows at once
+        return compute_mi(np.broadcast_to(theta_ref, theta_samp.shape), theta_samp, bins=20)
+
+    chunks = [theta_samp[k:k + chunk_size] for k in range(0, len(theta_samp), chunk_size)]
+    if estimator == 'knn':
+        fn, args = knn_mutual_information, [(np.broadcast_to(theta_ref, c.shape), c) for c in chunks]
+    else:
+        fn, args = _sklearn_mi_chunk, [(theta_ref, c) for c in chunks]
+    if workers == 1 or len(chunks) <= 1:
+        results = [fn(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            results = list(pool.map(fn, *zip(*args)))
+    return np.concatenate([np.atleast_1d(r) for r in results]) if results else np.empty(0)
+
+
+def compute_static_metrics_batch(samples, ion_cfg, temp_range, mi_estimator='knn', workers=1, chunk_size=256):
+    """
+    compute_static_metrics for every row of samples (n, 5) as arrays.
+
+    θ* is the nominal-K_d saturation (the same for every row) and ΔG is
+    evaluated with array arithmetic. MI depends on the sampled K_d only, and
+    Saltelli designs repeat each K_d across their A/B/AB_i blocks, so it is
+    evaluated once per distinct K_d and scattered back.
+    """
+    samples = np.asarray(samples, dtype=float)
+    lig_vals = ion_cfg['ligand_range']
+    L_star = (lig_vals[0] + lig_vals[1]) / 2.0
+    n_H = ion_cfg['n_H']['mean'] if isinstance(ion_cfg['n_H'], dict) else ion_cfg['n_H']
+    Kd_nominal = ion_cfg['K_d']['mean'] if isinstance(ion_cfg['K_d'], dict) else ion_cfg['K_d']
+    theta_nom = hill_equation(np.array([L_star]), n_H, Kd_nominal)[0]
+    T0 = np.mean(temp_range)
+    dH, dS, Kd_sample = samples[:, 0], samples[:, 1], samples[:, 2]
+    G_s = gibbs_free_energy(theta_nom, dH, dS, T0)
+
+    lig_grid = np.linspace(lig_vals[0], lig_vals[1], 100)
+    theta_ref = hill_equation(lig_grid, n_H, Kd_nominal)
+    Kd_unique, inverse = np.unique(Kd_sample, return_inverse=True)
+    theta_samp = hill_equation(lig_grid[None, :], n_H, Kd_unique[:, None])
+    MI = batch_mi(theta_ref, theta_samp, mi_estimator, workers, chunk_size)[inverse.ravel()]
+    return {'mi': MI, 'theta': np.full(len(samples), theta_nom), 'deltaG': G_s}
+
+
 def main():
     parser = argparse.ArgumentParser(description="Sobol sensitivity for BFIP metrics")
     parser.add_argument('--ion',    required=True, help='Ion name (e.g. Fe2+, Ca2+, H+)')
     parser.add_argument('--metric', default='mi', choices=['mi','theta','deltaG'], help='Metric to analyze')
     parser.add_argument('--config', default='pipeline/config.yaml', help='Path to config.yaml')
     parser.add_argument('--output', default='sobol_results.csv', help='Base filename for CSV and PNG')
+    parser.add_argument('--N', type=int, default=256, help='Saltelli base sample count (a power of two)')
+    parser.add_argument('--second-order', action='store_true', help='Also compute second-order indices S2')
+    parser.add_argument('--mi-estimator', default='knn', choices=MI_ESTIMATORS,
+                        help='MI estimator: knn (sklearn-equivalent), sklearn, histogram or gaussian')
+    parser.add_argument('--workers', type=int, default=1, help='Processes for the knn/sklearn MI path (0 = all cores)')
     args = parser.parse_args()
 
     cfg = load_config(args.config)
     names, bounds = get_bounds(cfg, args.ion)
     problem = {'num_vars': len(names), 'names': names, 'bounds': bounds}
-    samples = salib_sobol_sample.sample(problem, N=256, calc_second_order=False)
+    samples = salib_sobol_sample.sample(problem, N=args.N, calc_second_order=args.second_order)
     ion_cfg = cfg['ions'][args.ion]
     temp_range = cfg.get('temperature_range', [298.0, 310.0])
-    Y = np.array([compute_static_metrics(s, ion_cfg, temp_range)[args.metric] for s in samples])
-    Si = salib_sobol_analyze.analyze(problem, Y, calc_second_order=False, print_to_console=False)
+    Y = compute_static_metrics_batch(samples, ion_cfg, temp_range, args.mi_estimator, args.workers)[args.metric]
+    Si = salib_sobol_analyze.analyze(problem, Y, calc_second_order=args.second_order, print_to_console=False)
     df = pd.DataFrame({'S1': Si['S1'], 'ST': Si['ST']}, index=names)
     out_csv = args.output
     df.to_csv(out_csv)
     print(f"Sobol indices saved to {out_csv}")
+    if args.second_order:
+        out_s2 = os.path.splitext(out_csv)[0] + '_S2.csv'
+        pd.DataFrame(Si['S2'], index=names, columns=names).to_csv(out_s2)
+        print(f"Second-order indices saved to {out_s2}")
     title_map = {'mi':'MI','theta':'θ*','deltaG':'ΔG'}
     ax = df['S1'].plot.bar(title=f"{args.ion} {title_map[args.metric]} First-order Sobol")
     ax.set_ylabel('S1')
@@ -0,0 +1,166 @@
+"""
+sickle_solvers.py
+
+Shared solvers of the BFIP_Sickle_Model scripts (v1, v3 RuptureEngine,
+v4 PerturbationSweep). The scripts differ only in their O₂ profile and MI
+channel, so each passes a model dict:
+- 'ions': ion table (k_on, k_off, conc_range, pH_range, ...)
+- 'o2_dynamics': O₂ level at time t
+- 'binding_dynamics': the script's scalar (θ, MI) right-hand side
+- 'mi_terms': (t, θ, MI, O2_level, *extra) -> (dMI_dt, ∂/∂θ, ∂/∂MI),
+  elementwise on arrays; extra holds model arguments past ion_type
+  (the v4 perturbation)
+- 'mi_bounds': (lo, hi) clip of the MI channel
+
+θ relaxes at k_on·L + k_off (≥ 10²–10⁴ s⁻¹) while o2_dynamics varies on
+a seconds scale, so mode='qss' slaves θ to its fixed point and integrates
+only the non-stiff MI channel; mode='radau' solves the full stiff system.
+"""
+import numpy as np
+from scipy import sparse
+from scipy.integrate import solve_ivp
+
+
+def binding_rates(model, t, conc, pH, PCO2, T, ion_type):
+    """Forward (k_on·L) and reverse (k_off) rates of the θ channel at time t"""
+    ion = model['ions'][ion_type]
+    O2_level = model['o2_dynamics'](t)
+    effective_ligand = conc * (1 - 0.7 * (1 - O2_level))
+
+    k_on = ion['k_on']
+    k_off = ion['k_off'] * (
+        1 + 0.3 * PCO2 / 50 + 0.1 * (7.4 - pH)**2 + 0.02 * (T - 310.15)
+    )
+    return k_on * effective_ligand, k_off
+
+def theta_qss(model, t, conc, pH, PCO2, T, ion_type):
+    """
+    Quasi-steady θ: the root of dθ/dt = 0 at time t. θ relaxes at rate
+    k_on·L + k_off (≥ k_off ~ 10²–10⁴ s⁻¹), so after the first few ms it
+    tracks this value while o2_dynamics changes on a seconds scale.
+    """
+    forward, k_off = binding_rates(model, t, conc, pH, PCO2, T, ion_type)
+    return forward / (forward + k_off)
+
+def slow_dynamics(t, y, model, *args):
+    """MI channel of binding_dynamics with θ slaved to theta_qss"""
+    return model['binding_dynamics'](t, [theta_qss(model, t, *args[:5]), y[0]], *args)[1:]
+
+def solve_cell(model, args, y0, t, mode='radau'):
+    """
+    Final (θ, MI) of one grid cell; args are binding_dynamics' arguments
+    after (t, y).
+
+    mode='radau' integrates the full stiff system; mode='qss' sets θ to
+    theta_qss and integrates only the non-stiff MI channel with RK45.
+    """
+    if mode == 'radau':
+        sol = solve_ivp(model['binding_dynamics'], [t[0], t[-1]], y0, args=args,
+                        t_eval=t, method='Radau', rtol=1e-9, atol=1e-12)
+        return sol.y[0][-1], sol.y[1][-1]
+    if mode == 'qss':
+        sol = solve_ivp(slow_dynamics, [t[0], t[-1]], y0[1:], args=(model, *args),
+                        t_eval=t[-1:], method='RK45', rtol=1e-9, atol=1e-12)
+        return theta_qss(model, t[-1], *args[:5]), sol.y[0][-1]
+    raise ValueError(f"Unknown mode '{mode}' (expected 'radau' or 'qss')")
+
+def grid_system(model, concs, pHs, PCO2, T, ion_type, *extra):
+    """
+    Vector form of binding_dynamics over every (conc, pH) cell.
+
+    The state interleaves [θ_0, MI_0, θ_1, MI_1, ...] in row-major
+    (conc, pH) order. Cells are uncoupled, so the Jacobian is block-diagonal
+    with 2×2 blocks (lower bandwidth 1) and is built analytically. Rate
+    constants are resolved once here rather than on every RHS call.
+
+    Returns (rhs, jac, theta_eq) where theta_eq(t) is the per-cell theta_qss.
+    """
+    o2_dynamics = model['o2_dynamics']
+    mi_lo, mi_hi = model['mi_bounds']
+    C, P = np.meshgrid(concs, pHs, indexing='ij')
+    k_on_c = model['ions'][ion_type]['k_on'] * C.ravel()
+    _, k_off = binding_rates(model, 0.0, C.ravel(), P.ravel(), PCO2, T, ion_type)
+
+    def terms(t, y):
+        theta = np.clip(y[0::2], 0.0, 1.0)
+        MI = y[1::2]
+        O2_level = o2_dynamics(t)
+        forward = k_on_c * (1 - 0.7 * (1 - O2_level))
+        dMI_dt, dMI_dtheta, dMI_dMI = model['mi_terms'](t, theta, MI, O2_level, *extra)
+        return theta, MI, forward, dMI_dt, dMI_dtheta, dMI_dMI
+
+    def rhs(t, y):
+        theta, MI, forward, dMI_dt, _, _ = terms(t, y)
+        out = np.empty_like(y)
+        out[0::2] = forward * (1 - theta) - k_off * theta
+        out[1::2] = np.clip(MI + dMI_dt, mi_lo, mi_hi)
+        return out
+
+    def jac(t, y):
+        theta, MI, forward, dMI_dt, dMI_dtheta, dMI_dMI = terms(t, y)
+        # clip() has zero slope outside its range
+        live_theta = (y[0::2] >= 0.0) & (y[0::2] <= 1.0)
+        live_MI = (MI + dMI_dt > mi_lo) & (MI + dMI_dt < mi_hi)
+        main = np.empty_like(y)
+        main[0::2] = np.where(live_theta, -(forward + k_off), 0.0)
+        main[1::2] = np.where(live_MI, 1.0 + dMI_dMI, 0.0)
+        lower = np.zeros(len(y) - 1)
+        lower[0::2] = np.where(live_MI & live_theta, dMI_dtheta, 0.0)
+        return sparse.diags([lower, main], [-1, 0], format='csc')
+
+    def theta_eq(t):
+        forward = k_on_c * (1 - 0.7 * (1 - o2_dynamics(t)))
+        return forward / (forward + k_off)
+
+    return rhs, jac, theta_eq
+
+def solve_grid(model, concs, pHs, PCO2, T, ion_type, y0, t, mode='radau', extra=()):
+    """
+    Final (θ, MI) grids, each of shape (len(concs), len(pHs)), from a single
+    solver call over every cell (see grid_system). mode as in solve_cell.
+    """
+    rhs, jac, theta_eq = grid_system(model, concs, pHs, PCO2, T, ion_type, *extra)
+    shape = (len(concs), len(pHs))
+    n_cells = shape[0] * shape[1]
+    if mode == 'radau':
+        sol = solve_ivp(rhs, [t[0], t[-1]], np.tile(y0, n_cells), t_eval=t[-1:],
+                        method='Radau', jac=jac, rtol=1e-9, atol=1e-12)
+        return sol.y[0::2, -1].reshape(shape), sol.y[1::2, -1].reshape(shape)
+    if mode == 'qss':
+        def slow(t, MI):
+            y = np.empty(2 * n_cells)
+            y[0::2] = theta_eq(t)
+            y[1::2] = MI
+            return rhs(t, y)[1::2]
+        sol = solve_ivp(slow, [t[0], t[-1]], np.full(n_cells, float(y0[1])), t_eval=t[-1:],
+                        method='RK45', rtol=1e-9, atol=1e-12)
+        return theta_eq(t[-1]).reshape(shape), sol.y[:, -1].reshape(shape)
+    raise ValueError(f"Unknown mode '{mode}' (expected 'radau' or 'qss')")
+
+def check_qss(model, ion_type, n_cells=6, T=310.15, PCO2=50, y0=(0.4, 10.0), extra=()):
+    """
+    Accuracy check of the QSS shortcut: run both modes on n_cells cells
+    spread over the ion's (conc, pH) grid and return the largest absolute
+    θ and relative MI deviations.
+    """
+    ions = model['ions']
+    t = np.linspace(0, 800, 400)
+    concs = np.linspace(*ions[ion_type]['conc_range'])
+    pHs = np.linspace(*ions[ion_type]['pH_range'])
+    cells = np.linspace(0, len(concs) * len(pHs) - 1, n_cells).astype(int)
+    d_theta, d_MI = 0.0, 0.0
+    for k in cells:
+        args = (concs[k // len(pHs)], pHs[k % len(pHs)], PCO2, T, ion_type, *extra)
+        θ_ref, MI_ref = solve_cell(model, args, list(y0), t, 'radau')
+        θ_qss, MI_qss = solve_cell(model, args, list(y0), t, 'qss')
+        d_theta = max(d_theta, abs(θ_qss - θ_ref))
+        d_MI = max(d_MI, abs(MI_qss - MI_ref) / max(abs(MI_ref), 1.0))
+    print(f"[{ion_type}] QSS vs Radau over {n_cells} cells: max |Δθ|={d_theta:.2e}, max rel ΔMI={d_MI:.2e}")
+    return d_theta, d_MI
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+sweep_executor.py
+
+Shared executor for 2-D parameter sweeps (e.g. the ΔH × ΔS phase mappers).
+Cells are independent, so the flattened grid is cut into contiguous chunks
+that run on a process pool; results are reassembled in grid order, so the
+output does not depend on the worker count or on scheduling.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+
+def _run_chunk(cell_fn, cells):
+    return [cell_fn(x, y) for x, y in cells]
+
+
+def sweep_points(cell_fn, points, workers=1, chunk_size=None, **cell_kwargs):
+    """
+    Evaluate cell_fn(x, y, **cell_kwargs) on an arbitrary list of (x, y)
+    points, returning the results as a list in the order of `points`.
+    Same worker/chunking semantics as sweep_grid.
+    """
+    if cell_kwargs:
+        cell_fn = partial(cell_fn, **cell_kwargs)
+    if not workers:
+        workers = os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError(f"workers must be >= 0 (0 or None uses every core), got {workers}")
+
+    points = list(points)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(points) // (4 * workers)))
+    chunks = [points[k:k + chunk_size] for k in range(0, len(points), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [_run_chunk(cell_fn, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order regardless of completion order
+            results = list(pool.map(partial(_run_chunk, cell_fn), chunks))
+
+    return [r for chunk in results for r in chunk]
+
+
+def sweep_grid(cell_fn, x_vals, y_vals, workers=1, chunk_size=None, **cell_kwargs):
+    """
+    Evaluate cell_fn(x, y, **cell_kwargs) on every (x, y) of the grid.
+
+    Inputs:
+    - cell_fn: module-level (picklable) function of one grid cell
+    - x_vals, y_vals: 1-D axes; the result is indexed [i, j] like the
+      nested `for i, x ...: for j, y ...` loops it replaces
+    - workers: process count (1 runs in-process, 0 or None uses every core)
+    - chunk_size: cells per work unit (default: ~4 chunks per worker)
+
+    Returns an array of shape (len(x_vals), len(y_vals)) + the shape of one
+    cell result, so cells returning a tuple of k values give a trailing axis
+    of length k.
+    """
+    cells = [(x, y) for x in x_vals for y in y_vals]
+    flat = np.array(sweep_points(cell_fn, cells, workers, chunk_size, **cell_kwargs))
+    return flat.reshape((len(x_vals), len(y_vals)) + flat.shape[1:])
+
+
+def main():
+    pass
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,9 @@
 import numpy as np
 from scipy.integrate import odeint
 
+from models.kinetics import sinusoid_profile
+from models.cache import memoize
+
 R = 8.314  # J/(mol·K)
 
 def hill_equation(theta, t, k_on, amplitude, K_d, n_H):
@@ -10,7 +13,53 @@ def hill_equation(theta, t, k_on, amplitude, K_d, n_H):
     dtheta_dt = k_on * L_t**n_H * (1 - theta) - (k_on * K_d) * theta
     return dtheta_dt
 
-def run_dynamic_thermo(kinetic_params, ligand_range, T, t_span, dH, dS, n_H=1.0):
+def _phi1(z):
+    """(1 - e^-z) / z, continuous at z = 0"""
+    z_safe = np.where(z > 1e-12, z, 1.0)
+    return np.where(z > 1e-12, -np.expm1(-z_safe) / z_safe, 1.0)
+
+def exponential_theta(t_span, k_on, amplitude, K_d, n_H, theta0=0.0, max_step=0.1):
+    """
+    Exponential-integrator solution of the linear binding ODE.
+
+    Writes dθ/dt = -p(t)·(θ - θ_eq(t)) with p = k_on·(L^n + K_d) and
+    θ_eq = L^n / (L^n + K_d), then advances each sub-step exactly for p frozen
+    at the sub-step's mean ligand level (the analytic integral of the
+    sinusoidal profile, so the decay exponent is exact for n_H = 1) and θ_eq
+    linear across it. Unconditionally stable for the stiff k_on used
+    throughout the scripts.
+
+    k_on, amplitude, K_d, n_H and theta0 may be arrays; they are broadcast
+    together and the result has shape (*batch, len(t_span)). Intervals of the
+    requested grid longer than max_step are split into equal sub-steps.
+    """
+    t_span = np.asarray(t_span, dtype=float)
+    k_on, amplitude, K_d, n_H, theta = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (k_on, amplitude, K_d, n_H, theta0)))
+    theta = theta.copy()
+    out = np.empty(theta.shape + t_span.shape)
+    out[..., 0] = theta
+
+    ligand = sinusoid_profile(amplitude, amplitude, 0.1)
+
+    def equilibrium(t):
+        L_n = ligand.value(t) ** n_H
+        return L_n / (L_n + K_d)
+
+    for i in range(len(t_span) - 1):
+        n_sub = max(1, int(np.ceil(abs(t_span[i + 1] - t_span[i]) / max_step)))
+        nodes = np.linspace(t_span[i], t_span[i + 1], n_sub + 1)
+        eq0 = equilibrium(nodes[0])
+        for t0, t1 in zip(nodes[:-1], nodes[1:]):
+            L_avg = ligand.integral(t0, t1) / (t1 - t0)
+            eq1 = equilibrium(t1)
+            z = k_on * (L_avg ** n_H + K_d) * (t1 - t0)
+            theta = eq1 + (theta - eq0) * np.exp(-z) - (eq1 - eq0) * _phi1(z)
+            eq0 = eq1
+        out[..., i + 1] = theta
+    return out
+
+def run_dynamic_thermo(kinetic_params, ligand_range, T, t_span, dH, dS, n_H=1.0, solver='odeint'):
     """
     Run dynamic theta simulation with thermodynamic-dependent kinetics.
 
@@ -22,6 +71,9 @@ def run_dynamic_thermo(kinetic_params, ligand_range, T, t_span, dH, dS, n_H=1.0)
     - dH: enthalpy (J/mol)
     - dS: entropy (J/mol·K)
     - n_H: Hill coefficient
+    - solver: 'odeint' (default) or 'exponential' for exponential_theta;
+      the exponential backend also accepts arrays for k_on, amplitude, T,
+      dH, dS and n_H and returns theta with shape (*batch, len(t_span))
     """
     k_on = kinetic_params['k_on']
     amplitude = kinetic_params.get('amplitude', 1.0)
@@ -32,9 +84,52 @@ def run_dynamic_thermo(kinetic_params, ligand_range, T, t_span, dH, dS, n_H=1.0)
 
     # Integrate θ(t)
     theta0 = 0.0
+    if solver == 'exponential':
+        return t_span, exponential_theta(t_span, k_on, amplitude, K_d, n_H, theta0)
+    if solver != 'odeint':
+        raise ValueError(f"Unknown solver '{solver}' (expected 'odeint' or 'exponential')")
     theta_t = odeint(hill_equation, theta0, t_span, args=(k_on, amplitude, K_d, n_H))
     return t_span, theta_t.flatten()
 
+# Content-addressed variant for sweeps that revisit the same parameters; a
+# plain pass-through until models.cache.configure_cache() enables caching
+run_dynamic_thermo_cached = memoize(run_dynamic_thermo, name='thermo_dynamic_model.run_dynamic_thermo')
+
+def init_thermo_state(kinetic_params, T, dH, dS, n_H=1.0, theta0=0.0, t0=0.0):
+    """
+    Initialise a stepping state for step_thermo.
+
+    Same kinetics as run_dynamic_thermo, but θ is carried across calls so
+    per-timestep simulators integrate one continuous trajectory instead of
+    restarting from θ0 on every window. theta0 may be an array (e.g. one
+    entry per gate); k_on, T, dH, dS and n_H broadcast against it.
+    """
+    dG = dH - T * dS
+    return {
+        't': float(t0),
+        'theta': np.array(theta0, dtype=float),
+        'k_on': kinetic_params['k_on'],
+        'amplitude': kinetic_params.get('amplitude', 1.0),
+        'K_d': np.exp(dG / (R * T)),
+        'n_H': n_H,
+    }
+
+def step_thermo(state, dt, amplitude=None):
+    """
+    Advance a state from init_thermo_state by dt (in place).
+
+    amplitude overrides the ligand amplitude for this step only (scalar or
+    broadcastable to θ). Returns the window [θ(t), θ(t + dt)] with shape
+    (*θ.shape, 2).
+    """
+    if amplitude is None:
+        amplitude = state['amplitude']
+    window = exponential_theta([state['t'], state['t'] + dt], state['k_on'], amplitude,
+                               state['K_d'], state['n_H'], state['theta'])
+    state['t'] += dt
+    state['theta'] = window[..., -1]
+    return window
+
 
 def main():
     pass